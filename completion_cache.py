@@ -0,0 +1,169 @@
+"""
+Persistent content-addressed cache for xAI completions
+Entries expire per entry type (TTL) and the least recently used are evicted
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import metrics
+from persistence import DirtyFlag, atomic_write
+
+CACHE_FILE = os.getenv('COMPLETION_CACHE_FILE', 'completion_cache.json')
+CACHE_MAX_ENTRIES = int(os.getenv('COMPLETION_CACHE_MAX_ENTRIES', 1000))
+
+# TTL in seconds per entry type; 0 disables caching for that type.
+# Generation is off by default since a cached draft would repeat the same post.
+DEFAULT_TTLS = {
+    'review': int(os.getenv('CACHE_TTL_REVIEW', 7 * 24 * 3600)),
+    'review_escalation': int(os.getenv('CACHE_TTL_REVIEW', 7 * 24 * 3600)),
+    'reply': int(os.getenv('CACHE_TTL_REPLY', 0)),
+    'generate': int(os.getenv('CACHE_TTL_GENERATE', 0)),
+}
+
+
+class CompletionCache:
+    """
+    Disk-backed LRU cache keyed by a hash of everything that determines a completion
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, max_entries=CACHE_MAX_ENTRIES, ttls=None):
+        """
+        Initialize CompletionCache
+
+        Args:
+            cache_file (str): Path to the cache JSON file
+            max_entries (int): Size cap; least recently used entries are evicted
+            ttls (dict): Entry type -> TTL seconds (defaults to DEFAULT_TTLS)
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.ttls = ttls if ttls is not None else dict(DEFAULT_TTLS)
+        self.entries = OrderedDict()
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._dirty = DirtyFlag(self.save, 'completion_cache')
+        self.load()
+
+    @staticmethod
+    def make_key(model, system_prompt, prompt, temperature, prompt_version):
+        """
+        Build the content address for a completion request
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        material = json.dumps(
+            [model, system_prompt, prompt, temperature, prompt_version],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, entry_type):
+        """Return the TTL for an entry type (0 means not cached)"""
+        return self.ttls.get(entry_type, 0)
+
+    def get(self, key, entry_type):
+        """
+        Look up a cached completion
+
+        Args:
+            key (str): Key from make_key()
+            entry_type (str): Call site: 'review', 'reply', 'generate', ...
+
+        Returns:
+            str: Cached response, or None on a miss
+        """
+        if self.ttl_for(entry_type) <= 0:
+            return None
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry['expires_at'] > time.time():
+                self.entries.move_to_end(key)
+                self._count(entry_type, 'hits')
+                # Persist recency and hit counts with the next flush
+                self._dirty.mark_dirty()
+                return entry['value']
+
+            if entry:
+                del self.entries[key]
+            self._count(entry_type, 'misses')
+            return None
+
+    def put(self, key, entry_type, value):
+        """
+        Store a completion and persist the cache
+
+        Args:
+            key (str): Key from make_key()
+            entry_type (str): Entry type, selects the TTL
+            value (str): Response text
+        """
+        ttl = self.ttl_for(entry_type)
+        if ttl <= 0 or value is None:
+            return
+
+        with self._lock:
+            self.entries[key] = {
+                'type': entry_type,
+                'value': value,
+                'expires_at': time.time() + ttl
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                _, evicted = self.entries.popitem(last=False)
+                self._count(evicted.get('type', entry_type), 'evictions')
+            self._dirty.mark_dirty()
+
+    def _count(self, entry_type, outcome):
+        """Bump a hit/miss/eviction counter (persisted and in metrics)"""
+        type_stats = self.stats.setdefault(entry_type, {'hits': 0, 'misses': 0, 'evictions': 0})
+        type_stats[outcome] = type_stats.get(outcome, 0) + 1
+        metrics.increment(f'cache.{entry_type}.{outcome}')
+
+    def load(self):
+        """Load cache from file, dropping expired entries"""
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        now = time.time()
+        # Entries are stored least recently used first
+        for key, entry in data.get('entries', []):
+            if entry.get('expires_at', 0) > now:
+                self.entries[key] = entry
+        self.stats = data.get('stats', {})
+
+    def save(self):
+        """Save cache to file"""
+        with self._lock:
+            content = json.dumps({
+                'entries': list(self.entries.items()),
+                'stats': self.stats
+            })
+        atomic_write(self.cache_file, content)
+
+    def get_stats(self):
+        """
+        Get hit/miss statistics
+
+        Returns:
+            dict: Entry type -> {'hits', 'misses', 'evictions', 'hit_rate'}
+        """
+        with self._lock:
+            result = {}
+            for entry_type, counts in self.stats.items():
+                lookups = counts.get('hits', 0) + counts.get('misses', 0)
+                result[entry_type] = dict(
+                    counts,
+                    hit_rate=round(counts.get('hits', 0) / lookups, 3) if lookups else 0.0
+                )
+            result['entries'] = len(self.entries)
+            return result
@@ -0,0 +1,152 @@
+"""
+Inventory of pre-generated, already-approved posts
+A background producer keeps it filled so posting never waits on xAI
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+
+import metrics
+import transport
+from persistence import DirtyFlag, atomic_write
+
+INVENTORY_FILE = transport.state_path(os.getenv('INVENTORY_FILE', 'content_inventory.json'))
+# Approved posts to keep on hand per content type
+INVENTORY_TARGET_DEPTH = int(os.getenv('INVENTORY_TARGET_DEPTH', 2))
+# How long an approved post stays usable, by how time-sensitive its topics are
+INVENTORY_TTL_NEWS_HOURS = float(os.getenv('INVENTORY_TTL_NEWS_HOURS', 6))
+INVENTORY_TTL_EVERGREEN_HOURS = float(os.getenv('INVENTORY_TTL_EVERGREEN_HOURS', 72))
+
+# Topics from NewsMonitor are about a specific story and go stale quickly
+NEWS_TOPIC_PREFIXES = ('Hacker News:', 'GitHub Trend:')
+
+
+def topic_ttl(topics):
+    """
+    Shelf life of a post written for these topics
+
+    Args:
+        topics (list): Topics the post was generated for
+
+    Returns:
+        timedelta: TTL of the most time-sensitive topic
+    """
+    if any(topic.startswith(NEWS_TOPIC_PREFIXES) for topic in topics or []):
+        return timedelta(hours=INVENTORY_TTL_NEWS_HOURS)
+    return timedelta(hours=INVENTORY_TTL_EVERGREEN_HOURS)
+
+
+class ContentInventory:
+    """
+    Persisted queue of approved posts per content type, with per-entry expiry
+    """
+
+    def __init__(self, inventory_file=INVENTORY_FILE, target_depth=INVENTORY_TARGET_DEPTH):
+        """
+        Initialize ContentInventory
+
+        Args:
+            inventory_file (str): Path to the inventory JSON file
+            target_depth (int): Approved posts to keep per content type
+        """
+        self.inventory_file = inventory_file
+        self.target_depth = target_depth
+        self.entries = []
+        # The producer thread adds while the posting cycle takes
+        self._lock = threading.Lock()
+        self._dirty = DirtyFlag(self.save, 'inventory')
+        self.load()
+
+    def add(self, post_text, score, feedback, content_type, topics):
+        """
+        Store an approved post
+
+        Args:
+            post_text (str): Approved post
+            score (int): Reviewer score
+            feedback (str): Reviewer feedback
+            content_type (str): 'controversial' or 'relatable'
+            topics (list): Topics it was generated for (decide the expiry)
+        """
+        now = datetime.now()
+        with self._lock:
+            self.entries.append({
+                'post_text': post_text,
+                'score': score,
+                'feedback': feedback,
+                'content_type': content_type,
+                'topics': topics,
+                'created_at': now.isoformat(),
+                'expires_at': (now + topic_ttl(topics)).isoformat()
+            })
+            metrics.increment('inventory.produced')
+            # Written right away: the producer may run for a long time between flushes
+            self._dirty.mark_dirty()
+        self._dirty.flush()
+
+    def take(self, content_type):
+        """
+        Remove and return the approved post of this type that expires soonest
+
+        Returns:
+            dict: Inventory entry, or None if none is available
+        """
+        with self._lock:
+            self._drop_expired()
+            available = [e for e in self.entries if e['content_type'] == content_type]
+            if not available:
+                metrics.increment('inventory.misses')
+                return None
+
+            entry = min(available, key=lambda e: e['expires_at'])
+            self.entries.remove(entry)
+            metrics.increment('inventory.hits')
+            self._dirty.mark_dirty()
+            return entry
+
+    def most_needed(self, content_types):
+        """
+        Content type furthest below the target depth
+
+        Returns:
+            str: Content type to produce next, or None if all are full
+        """
+        with self._lock:
+            self._drop_expired()
+            deficits = {
+                content_type: self.target_depth - sum(1 for e in self.entries if e['content_type'] == content_type)
+                for content_type in content_types
+            }
+        content_type = max(deficits, key=deficits.get)
+        return content_type if deficits[content_type] > 0 else None
+
+    def depth(self, content_type=None):
+        """Number of unexpired entries (of one type, or in total)"""
+        with self._lock:
+            self._drop_expired()
+            return sum(1 for e in self.entries if content_type in (None, e['content_type']))
+
+    def _drop_expired(self):
+        """Discard stale entries (caller holds the lock)"""
+        now = datetime.now().isoformat()
+        fresh = [e for e in self.entries if e['expires_at'] > now]
+        if len(fresh) != len(self.entries):
+            metrics.increment('inventory.expired', len(self.entries) - len(fresh))
+            self.entries = fresh
+            self._dirty.mark_dirty()
+
+    def load(self):
+        """Load inventory from file"""
+        try:
+            with open(self.inventory_file, 'r') as f:
+                self.entries = json.load(f).get('entries', [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = []
+
+    def save(self):
+        """Save inventory to file"""
+        with self._lock:
+            content = json.dumps({'entries': self.entries}, indent=2)
+        atomic_write(self.inventory_file, content)
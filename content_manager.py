@@ -7,6 +7,9 @@ import json
 import os
 from datetime import datetime
 
+import transport
+from persistence import DirtyFlag, atomic_write_json
+
 
 class TrendingTopicsManager:
     """
@@ -14,21 +17,28 @@ class TrendingTopicsManager:
     Tracks recently used topics to avoid repetition
     """
     
-    def __init__(self, history_file='topic_history.json', max_history=50):
+    def __init__(self, history_file=transport.state_path('topic_history.json'), max_history=50, store=None):
         """
         Initialize TrendingTopicsManager
         
         Args:
             history_file (str): Path to topic history JSON file
             max_history (int): Maximum number of topics to track
+            store (SQLiteStore): Keep topics in this database instead of the JSON file
         """
         self.history_file = history_file
         self.max_history = max_history
+        self.store = store
         self.recent_topics = []
+        # Topics are added one at a time; they are written together on flush
+        self._dirty = DirtyFlag(self.save_history, 'topics')
         self.load_history()
     
     def load_history(self):
         """Load topic history from file"""
+        if self.store:
+            # Queries go to the database; nothing is held in memory
+            return
         try:
             with open(self.history_file, 'r') as f:
                 data = json.load(f)
@@ -39,12 +49,13 @@ class TrendingTopicsManager:
     
     def save_history(self):
         """Save topic history to file"""
+        if self.store:
+            return
         data = {
             'topics': self.recent_topics,
             'last_updated': datetime.now().isoformat()
         }
-        with open(self.history_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        atomic_write_json(self.history_file, data, indent=2)
     
     def add_topic(self, topic):
         """
@@ -53,6 +64,10 @@ class TrendingTopicsManager:
         Args:
             topic (str): Topic to track
         """
+        if self.store:
+            self.store.add_topic(topic)
+            return
+        
         # Add topic with timestamp
         topic_entry = {
             'topic': topic,
@@ -65,7 +80,7 @@ class TrendingTopicsManager:
         if len(self.recent_topics) > self.max_history:
             self.recent_topics = self.recent_topics[-self.max_history:]
         
-        self.save_history()
+        self._dirty.mark_dirty()
     
     def is_fresh_topic(self, topic):
         """
@@ -77,6 +92,9 @@ class TrendingTopicsManager:
         Returns:
             bool: True if topic is fresh (not used in last 10 posts)
         """
+        if self.store:
+            return not self.store.topic_used_recently(topic, 10)
+        
         # Check last 10 topics
         recent_topic_names = [
             t['topic'].lower() 
@@ -178,7 +196,11 @@ class TrendingTopicsManager:
         Returns:
             dict: Topic usage statistics
         """
-        total_topics = len(self.recent_topics)
+        if self.store:
+            sorted_topics = self.store.topic_counts(self.max_history)
+            total_topics = sum(count for _, count in sorted_topics)
+        else:
+            total_topics = len(self.recent_topics)
         
         if total_topics == 0:
             return {
@@ -187,31 +209,34 @@ class TrendingTopicsManager:
                 'least_used_topics': []
             }
         
-        # Count topic usage
-        topic_counts = {}
-        for entry in self.recent_topics:
-            if 'topic' in entry:
-                topic = entry['topic']
-                topic_counts[topic] = topic_counts.get(topic, 0) + 1
-        
-        # Sort by usage
-        sorted_topics = sorted(
-            topic_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        if not self.store:
+            # Count topic usage
+            topic_counts = {}
+            for entry in self.recent_topics:
+                if 'topic' in entry:
+                    topic = entry['topic']
+                    topic_counts[topic] = topic_counts.get(topic, 0) + 1
+            
+            # Sort by usage
+            sorted_topics = sorted(
+                topic_counts.items(),
+                key=lambda x: x[1],
+                reverse=True
+            )
         
         return {
             'total_topics_used': total_topics,
-            'unique_topics': len(topic_counts),
+            'unique_topics': len(sorted_topics),
             'most_used_topics': sorted_topics[:5],
             'least_used_topics': sorted_topics[-5:] if len(sorted_topics) > 5 else []
         }
     
     def clear_history(self):
         """Clear all topic history"""
+        if self.store:
+            self.store.clear_topics()
         self.recent_topics = []
-        self.save_history()
+        self._dirty.mark_dirty()
 
 
 # Testing
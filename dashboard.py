@@ -10,6 +10,13 @@ from datetime import datetime, timedelta
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from dotenv import load_dotenv
+
+# STATE_BACKEND / STATE_DB_FILE must be loaded before the store modules read them
+load_dotenv()
+
+from state_store import STATE_BACKEND, load_state
+from sqlite_store import SQLiteStore, STATE_DB_FILE
 
 
 # Page configuration
@@ -20,8 +27,6 @@ st.set_page_config(
 )
 
 # File paths
-ACTIVITY_LOG = 'bot_activity.json'
-POSTED_HISTORY = 'posted_history.json'
 TOPIC_HISTORY = 'topic_history.json'
 
 
@@ -37,6 +42,12 @@ def load_json_file(filepath, default=None):
         return default if default is not None else {}
 
 
+@st.cache_resource
+def open_state_db():
+    """Read-only connection to the bot database, opened once and reused across reruns"""
+    return SQLiteStore(readonly=True)
+
+
 def format_time_ago(iso_timestamp):
     """Format ISO timestamp as 'X hours/days ago'"""
     try:
@@ -63,17 +74,23 @@ def main():
     st.markdown("*Unfiltered tech takes that start arguments*")
     
     # Load data
-    activity = load_json_file(ACTIVITY_LOG, default={
-        'total_posts': 0,
-        'successful_posts': 0,
-        'failed_posts': 0,
-        'total_rejections': 0,
-        'last_post_time': None,
-        'next_post_time': None
-    })
-    
-    history = load_json_file(POSTED_HISTORY, default=[])
-    topic_history = load_json_file(TOPIC_HISTORY, default={'topics': []})
+    if STATE_BACKEND == 'sqlite' and os.path.exists(STATE_DB_FILE):
+        store = open_state_db()
+        activity = store.activity()
+        history = store.history()
+        type_counts = store.content_type_counts()
+        topic_history = {'topics': store.recent_topics()}
+        topic_counts = store.topic_counts()
+    else:
+        # Bot state snapshot plus the events logged since
+        state, _ = load_state()
+        activity = state['activity']
+        history = state['history']
+        type_counts = {}
+        for post in history:
+            type_counts[post.get('content_type')] = type_counts.get(post.get('content_type'), 0) + 1
+        topic_history = load_json_file(TOPIC_HISTORY, default={'topics': []})
+        topic_counts = None
     
     # Sidebar - Bot Status
     with st.sidebar:
@@ -131,14 +148,14 @@ def main():
         
         with col3:
             # Count content types
-            controversial_count = sum(1 for p in history if p.get('content_type') == 'controversial')
+            controversial_count = type_counts.get('controversial', 0)
             st.metric(
                 "Controversial",
                 controversial_count
             )
         
         with col4:
-            relatable_count = sum(1 for p in history if p.get('content_type') == 'relatable')
+            relatable_count = type_counts.get('relatable', 0)
             st.metric(
                 "Relatable",
                 relatable_count
@@ -195,6 +212,28 @@ def main():
                     st.plotly_chart(fig_scores, use_container_width=True)
         else:
             st.info("No posts yet. Start the bot to see metrics!")
+        
+        # LLM pipeline metrics (latency, counters) saved by the bot
+        pipeline = activity.get('metrics', {})
+        if pipeline.get('latency') or pipeline.get('counters'):
+            st.subheader("LLM Pipeline")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                if pipeline.get('latency'):
+                    latency_df = pd.DataFrame.from_dict(pipeline['latency'], orient='index')
+                    st.markdown("**Latency (seconds)**")
+                    st.dataframe(latency_df, use_container_width=True)
+            
+            with col2:
+                if pipeline.get('counters'):
+                    counters_df = pd.DataFrame(
+                        sorted(pipeline['counters'].items()),
+                        columns=['Counter', 'Value']
+                    )
+                    st.markdown("**Counters**")
+                    st.dataframe(counters_df, hide_index=True, use_container_width=True)
     
     # Tab 2: Recent Posts
     with tab2:
@@ -266,19 +305,22 @@ def main():
         if len(topics) > 0:
             st.markdown(f"**Total Topics Used:** {len(topics)}")
             
-            # Count topic usage
-            topic_counts = {}
-            for entry in topics:
-                if 'topic' in entry:
-                    topic = entry['topic']
-                    topic_counts[topic] = topic_counts.get(topic, 0) + 1
-            
-            # Sort by usage
-            sorted_topics = sorted(
-                topic_counts.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
+            if topic_counts is not None:
+                sorted_topics = topic_counts
+            else:
+                # Count topic usage
+                counts = {}
+                for entry in topics:
+                    if 'topic' in entry:
+                        topic = entry['topic']
+                        counts[topic] = counts.get(topic, 0) + 1
+                
+                # Sort by usage
+                sorted_topics = sorted(
+                    counts.items(),
+                    key=lambda x: x[1],
+                    reverse=True
+                )
             
             # Most used topics chart
             if len(sorted_topics) > 0:
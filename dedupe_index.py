@@ -0,0 +1,268 @@
+"""
+Near-duplicate detection over posted and rejected drafts (MinHash + LSH)
+Signatures are persisted so the index updates incrementally across restarts
+"""
+
+import os
+import re
+import json
+import zlib
+import hashlib
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import metrics
+import transport
+from persistence import DirtyFlag, atomic_write
+
+DEDUPE_INDEX_FILE = transport.state_path(os.getenv('DEDUPE_INDEX_FILE', 'dedupe_index.json'))
+# Estimated Jaccard similarity (character shingles) at which a draft is a near-duplicate
+DEDUPE_THRESHOLD = float(os.getenv('DEDUPE_THRESHOLD', 0.7))
+DEDUPE_MAX_ENTRIES = int(os.getenv('DEDUPE_MAX_ENTRIES', 5000))
+
+SHINGLE_SIZE = 5
+# 16 bands of 4 rows: pairs above ~0.5 similarity almost always share a bucket
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+# Added per step when an empty bin borrows a neighbour's value, so borrowed
+# values never collide with real ones
+_EMPTY_OFFSET = 1 << 32
+
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+
+def signature(text):
+    """
+    MinHash signature of a text's character shingles
+
+    Uses one-permutation hashing: each shingle is hashed once and the hash
+    picks one of NUM_PERM bins, which keeps its minimum. Empty bins borrow the
+    next filled bin's value (rotation densification) so every slot is usable
+    for banding.
+
+    Returns:
+        list: NUM_PERM ints
+    """
+    normalized = normalize(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+    bins = [None] * NUM_PERM
+    for shingle in shingles:
+        bin_index, value = divmod(zlib.crc32(shingle.encode('utf-8')), 1 << 26)
+        bin_index %= NUM_PERM
+        if bins[bin_index] is None or value < bins[bin_index]:
+            bins[bin_index] = value
+
+    sig = list(bins)
+    for i in range(NUM_PERM):
+        if sig[i] is None:
+            for step in range(1, NUM_PERM):
+                borrowed = bins[(i + step) % NUM_PERM]
+                if borrowed is not None:
+                    sig[i] = borrowed + step * _EMPTY_OFFSET
+                    break
+    return sig
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+class DedupeIndex:
+    """
+    MinHash/LSH index of past drafts
+
+    Each entry is banded into NUM_BANDS buckets; a query only compares against
+    entries sharing at least one bucket, plus an exact-text lookup.
+    """
+
+    def __init__(self, index_file=DEDUPE_INDEX_FILE, threshold=DEDUPE_THRESHOLD,
+                 max_entries=DEDUPE_MAX_ENTRIES):
+        """
+        Initialize DedupeIndex
+
+        Args:
+            index_file (str): Path to the index JSON file
+            threshold (float): Similarity at or above which drafts are duplicates
+            max_entries (int): Oldest entries are dropped beyond this size
+        """
+        self.index_file = index_file
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.entries = {}
+        self.next_id = 0
+        self._buckets = defaultdict(set)
+        self._exact = {}
+        # The inventory producer thread adds and queries alongside the main loop
+        self._lock = threading.RLock()
+        # Adds only mark the index dirty; persistence.flush_all() writes it
+        self._dirty = DirtyFlag(self.save, 'dedupe')
+        self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _bands(self, sig):
+        """Bucket keys for a signature, one per band"""
+        return [
+            f"{band}:{'.'.join(map(str, sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))}"
+            for band in range(NUM_BANDS)
+        ]
+
+    def _exact_key(self, text):
+        return hashlib.sha1(normalize(text).encode('utf-8')).hexdigest()
+
+    def _index(self, entry_id, entry):
+        """Add an entry to the in-memory buckets"""
+        for band in self._bands(entry['signature']):
+            self._buckets[band].add(entry_id)
+        self._exact[entry['exact']] = entry_id
+
+    def _unindex(self, entry_id, entry):
+        """Remove an entry from the in-memory buckets"""
+        for band in self._bands(entry['signature']):
+            self._buckets[band].discard(entry_id)
+        if self._exact.get(entry['exact']) == entry_id:
+            del self._exact[entry['exact']]
+
+    def add(self, text, source, save=True):
+        """
+        Index a draft
+
+        Args:
+            text (str): Post text
+            source (str): 'posted', 'rejected' or 'inventory'
+            save (bool): Mark the index for the next flush
+
+        Returns:
+            bool: False if the exact text was already indexed
+        """
+        with self._lock:
+            exact = self._exact_key(text)
+            existing = self._exact.get(exact)
+            if existing is not None:
+                # A rejected draft that later gets posted counts as posted
+                if source == 'posted' and self.entries[existing]['source'] != source:
+                    self.entries[existing]['source'] = source
+                    if save:
+                        self._dirty.mark_dirty()
+                return False
+
+            entry_id = str(self.next_id)
+            self.next_id += 1
+            entry = {
+                'text': text,
+                'source': source,
+                'timestamp': datetime.now().isoformat(),
+                'exact': exact,
+                'signature': signature(text)
+            }
+            self.entries[entry_id] = entry
+            self._index(entry_id, entry)
+
+            # Entries are kept in insertion order, so the first ones are the oldest
+            while len(self.entries) > self.max_entries:
+                oldest_id = next(iter(self.entries))
+                self._unindex(oldest_id, self.entries.pop(oldest_id))
+
+            if save:
+                self._dirty.mark_dirty()
+            return True
+
+    def find_duplicate(self, text, sources=None):
+        """
+        Find the most similar indexed draft at or above the threshold
+
+        Args:
+            text (str): Draft to check
+            sources (tuple): Only match entries from these sources (default: all)
+
+        Returns:
+            tuple: (entry dict, similarity) or None if the draft is new
+        """
+        with self._lock:
+            exact_id = self._exact.get(self._exact_key(text))
+            if exact_id is not None and (not sources or self.entries[exact_id]['source'] in sources):
+                metrics.increment('dedupe.exact')
+                return self.entries[exact_id], 1.0
+
+            best = self.closest(text, sources)
+            if best and best[1] >= self.threshold:
+                metrics.increment('dedupe.near')
+                return best
+            return None
+
+    def closest(self, text, sources=None):
+        """
+        Find the most similar indexed draft among those sharing an LSH band
+
+        Args:
+            text (str): Draft to check
+            sources (tuple): Only match entries from these sources (default: all)
+
+        Returns:
+            tuple: (entry dict, similarity) or None if no entry shares a band
+        """
+        with self._lock:
+            sig = signature(text)
+            candidates = set()
+            for band in self._bands(sig):
+                candidates |= self._buckets.get(band, set())
+
+            best = None
+            for entry_id in candidates:
+                entry = self.entries[entry_id]
+                if sources and entry['source'] not in sources:
+                    continue
+                score = similarity(sig, entry['signature'])
+                if best is None or score > best[1]:
+                    best = (entry, score)
+            return best
+
+    def bootstrap(self, history, rejections):
+        """
+        Build the index once from existing logs
+
+        Args:
+            history (list): Posted history entries
+            rejections (list): Rejection entries from the bot state
+        """
+        for entry in rejections:
+            if entry.get('post_text'):
+                self.add(entry['post_text'], 'rejected', save=False)
+        for entry in history:
+            if entry.get('post_text'):
+                self.add(entry['post_text'], 'posted', save=False)
+        self.save()
+        print(f"🗂️  Dedupe index built from {len(history)} posts and {len(rejections)} rejections")
+
+    def load(self):
+        """Load signatures from file and rebuild the buckets"""
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        self.next_id = data.get('next_id', 0)
+        self.entries = data.get('entries', {})
+        for entry_id, entry in self.entries.items():
+            self._index(entry_id, entry)
+
+    def save(self):
+        """Save index to file"""
+        with self._lock:
+            content = json.dumps({
+                'next_id': self.next_id,
+                'entries': self.entries
+            })
+        atomic_write(self.index_file, content)
@@ -6,19 +6,29 @@ Posts 2-3 times daily with 4-8 hour delays between posts
 
 import os
 import time
+import asyncio
+import threading
 import random
-import json
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+# Load environment variables (before the modules that read config at import time)
+load_dotenv()
+
 # Import updated modules
 from agents import CreatorAgent, ReviewerAgent
 from x_handler import XHandler
 from content_manager import TrendingTopicsManager
 from news_monitor import NewsMonitor
-
-# Load environment variables
-load_dotenv()
+from dedupe_index import DedupeIndex, signature, similarity
+from content_inventory import ContentInventory
+from state_store import STATE_BACKEND, open_store
+from scheduler import Scheduler, Job
+import metrics
+import persistence
+import text_analysis
+import transport
+import tweet_length
 
 # Configuration
 POST_FREQUENCY_HOURS_MIN = float(os.getenv('POST_FREQUENCY_HOURS_MIN', 0.33))
@@ -27,10 +37,45 @@ CONTROVERSIAL_WEIGHT = int(os.getenv('CONTROVERSIAL_WEIGHT', 70))
 RELATABLE_WEIGHT = int(os.getenv('RELATABLE_WEIGHT', 30))
 MIN_SCORE_THRESHOLD = int(os.getenv('MIN_SCORE_THRESHOLD', 8))
 MAX_RETRIES = 3
-
-# File paths
-ACTIVITY_LOG = 'bot_activity.json'
-POSTED_HISTORY = 'posted_history.json'
+# Drafts requested per generation call; above 1, one call yields all candidates
+# and each is reviewed in turn instead of running the serial MAX_RETRIES loop
+CANDIDATES_PER_REQUEST = int(os.getenv('CANDIDATES_PER_REQUEST', 1))
+# Score all candidates in one reviewer request instead of one request each
+BATCH_REVIEW = os.getenv('BATCH_REVIEW', 'true').lower() == 'true'
+# After a rejection, revise the rejected draft using the reviewer's feedback
+# instead of generating the next attempt from scratch
+REVISE_REJECTED = os.getenv('REVISE_REJECTED', 'true').lower() == 'true'
+# Serial mode: draft the next attempt while the current one is in review
+# (the speculative draft is discarded once one is approved; replaces revision)
+PIPELINED_GENERATION = os.getenv('PIPELINED_GENERATION', 'false').lower() == 'true'
+# Keep an inventory of approved posts filled by a background producer thread,
+# so the posting cycle only dequeues and publishes (see content_inventory.py)
+INVENTORY_ENABLED = os.getenv('INVENTORY_ENABLED', 'false').lower() == 'true'
+# Producer pause when the inventory is full, and after a failed production
+INVENTORY_REFILL_INTERVAL_S = float(os.getenv('INVENTORY_REFILL_INTERVAL_S', 300))
+INVENTORY_RETRY_S = float(os.getenv('INVENTORY_RETRY_S', 120))
+# Tournament mode: above 1, generate and review this many drafts concurrently
+# and post the best; calls still unfinished after the deadline are dropped
+TOURNAMENT_SIZE = int(os.getenv('TOURNAMENT_SIZE', 0))
+TOURNAMENT_DEADLINE_S = float(os.getenv('TOURNAMENT_DEADLINE_S', 90))
+# Recurring jobs: seconds between runs, plus up to *_JITTER_S random seconds.
+# Posting runs exactly at next_post_time
+MENTION_POLL_INTERVAL_S = float(os.getenv('MENTION_POLL_INTERVAL_S', 300))
+MENTION_POLL_JITTER_S = float(os.getenv('MENTION_POLL_JITTER_S', 30))
+METRICS_INTERVAL_S = float(os.getenv('METRICS_INTERVAL_S', 1800))
+METRICS_JITTER_S = float(os.getenv('METRICS_JITTER_S', 120))
+LEARNING_INTERVAL_S = float(os.getenv('LEARNING_INTERVAL_S', 3600))
+LEARNING_JITTER_S = float(os.getenv('LEARNING_JITTER_S', 300))
+# Worker threads per priority lane: replies to mentions run in their own lane
+# so a long posting cycle (generation, learning, trends) never delays them
+REPLY_LANE_WORKERS = int(os.getenv('REPLY_LANE_WORKERS', 1))
+BACKGROUND_LANE_WORKERS = int(os.getenv('BACKGROUND_LANE_WORKERS', 1))
+# Reject drafts that fail deterministic checks before paying for a reviewer call
+PRE_REVIEW_GATE = os.getenv('PRE_REVIEW_GATE', 'true').lower() == 'true'
+# Recent posts checked for duplicate openings
+RECENT_POSTS_WINDOW = int(os.getenv('RECENT_POSTS_WINDOW', 50))
+# Drop drafts that near-duplicate a past post or rejection (see dedupe_index.py)
+DEDUPE_ENABLED = os.getenv('DEDUPE_ENABLED', 'true').lower() == 'true'
 
 
 class EngagementBot:
@@ -40,51 +85,28 @@ class EngagementBot:
     
     def __init__(self):
         """Initialize bot with handlers and managers"""
+        # Guards multi-step state updates across the lanes and the inventory producer thread
+        self._state_lock = threading.RLock()
+        # Activity, posted history and reply tracking (see state_store.py)
+        self.store = open_store()
         self.x_handler = XHandler()
-        self.trending_manager = TrendingTopicsManager()
+        # Topics share the SQLite database when that backend is used
+        self.trending_manager = TrendingTopicsManager(store=self.store if STATE_BACKEND == 'sqlite' else None)
         self.news_monitor = NewsMonitor()
-        self.load_activity_log()
-        self.load_posted_history()
-        self.last_mention_id = self.activity.get('last_mention_id')
-        self.learning_context = self.activity.get('learning_context', "")
+        self.dedupe = DedupeIndex()
+        # Repaired drafts waiting for the gate, to count avoided regenerations
+        self._repaired_drafts = set()
+        self.inventory = ContentInventory() if INVENTORY_ENABLED else None
+        self._producer_stop = threading.Event()
+        if not len(self.dedupe):
+            self.dedupe.bootstrap(self.store.history(), self.store.recent('rejections'))
+        self.last_mention_id = self.store.get('last_mention_id')
+        self.learning_context = self.store.get('learning_context', "")
         
-    def load_activity_log(self):
-        """Load or create activity log"""
-        try:
-            with open(ACTIVITY_LOG, 'r') as f:
-                self.activity = json.load(f)
-        except FileNotFoundError:
-            self.activity = {
-                'total_posts': 0,
-                'successful_posts': 0,
-                'failed_posts': 0,
-                'total_rejections': 0,
-                'last_post_time': None,
-                'next_post_time': None,
-                'last_mention_id': None,
-                'learning_context': "",
-                'reply_tracking': {}
-            }
-            self.save_activity_log()
-    
-    def save_activity_log(self):
-        """Save activity log to file"""
-        with open(ACTIVITY_LOG, 'w') as f:
-            json.dump(self.activity, f, indent=2)
-    
-    def load_posted_history(self):
-        """Load or create posted history"""
-        try:
-            with open(POSTED_HISTORY, 'r') as f:
-                self.history = json.load(f)
-        except FileNotFoundError:
-            self.history = []
-            self.save_posted_history()
-    
-    def save_posted_history(self):
-        """Save posted history to file"""
-        with open(POSTED_HISTORY, 'w') as f:
-            json.dump(self.history, f, indent=2)
+    def save_metrics(self):
+        """Record the current pipeline metrics for the dashboard"""
+        with self._state_lock:
+            self.store.set('metrics', metrics.snapshot())
     
     def select_content_type(self):
         """
@@ -109,79 +131,372 @@ class EngagementBot:
         Returns:
             bool: True if has engagement hook
         """
-        hooks = [
-            '?',  # Questions drive replies
-            '👇', '👀', '🤔', '🤷‍♂️', '💀', '🔥', '😅',  # Engagement emojis
-            'what do you think',
-            'change my mind',
-            'who else',
-            'relatable',
-            'just me',
-            'thoughts',
-            'fight me',
-            'anyone else',
-            'prove me wrong',
-            'am i wrong',
-            'i said what i said',
-            'cope',
-            'cry about it',
-            'debate me',
-            'agree',
-            'disagree',
-            'opinion',
-            'wrong',
-            'right',
-            'deny it',
-            'why',
-        ]
-        
-        text_lower = text.lower()
-        return any(hook in text_lower for hook in hooks)
+        return text_analysis.has_engagement_hook(text)
     
     def generate_and_review_post(self, content_type, trending_topics):
         """
         Generate post and review it, retry up to MAX_RETRIES times
+        (or review CANDIDATES_PER_REQUEST drafts from one generation call,
+        or run a TOURNAMENT_SIZE tournament)
         """
         creator = CreatorAgent(content_type=content_type)
         reviewer = ReviewerAgent(min_score=MIN_SCORE_THRESHOLD)
         
+        if TOURNAMENT_SIZE > 1:
+            return self._run_detached(self._run_tournament(creator, reviewer, content_type, trending_topics))
+        if CANDIDATES_PER_REQUEST > 1:
+            return self._generate_and_review_candidates(creator, reviewer, content_type, trending_topics)
+        if PIPELINED_GENERATION:
+            return self._run_detached(self._run_pipelined(creator, reviewer, content_type, trending_topics))
+        
+        rejected = None
         for attempt in range(MAX_RETRIES):
             print(f"\n{'='*80}")
-            print(f"Attempt {attempt + 1}/{MAX_RETRIES} - Generating {content_type} post...")
-            
-            # Generate post with learning context
-            post_text = creator.generate(
-                trending_topics=trending_topics, 
-                self_learning_context=self.learning_context
-            )
+            revision = bool(rejected and REVISE_REJECTED)
+            if revision:
+                print(f"Attempt {attempt + 1}/{MAX_RETRIES} - Revising rejected {content_type} post with feedback...")
+                post_text = creator.revise(
+                    *rejected,
+                    trending_topics=trending_topics,
+                    self_learning_context=self.learning_context
+                )
+            else:
+                print(f"Attempt {attempt + 1}/{MAX_RETRIES} - Generating {content_type} post...")
+                
+                # Generate post with learning context
+                post_text = creator.generate(
+                    trending_topics=trending_topics, 
+                    self_learning_context=self.learning_context
+                )
             
             if not post_text:
                 print(f"Generation failed on attempt {attempt + 1}")
+                rejected = None
                 continue
             
-            print(f"Generated: {post_text}")
-            print(f"Length: {len(post_text)} chars")
-            
-            # Review post
-            score, feedback = reviewer.evaluate(post_text, content_type=content_type)
-            
-            print(f"\nReview Score: {score}/{MIN_SCORE_THRESHOLD}")
-            print(f"Feedback:\n{feedback}")
-            
-            # Check if post passes threshold AND has engagement hook
-            has_hook = self.has_engagement_hook(post_text)
-            print(f"Has engagement hook: {has_hook}")
-            
-            if reviewer.passes_threshold(score) and has_hook:
-                print(f"✅ POST APPROVED - Score: {score}, Has Hook: {has_hook}")
+            post_text = self._repair_draft(creator, post_text)
+            approved, score, feedback = self._review_draft(reviewer, post_text, content_type, revision=revision)
+            if approved:
                 return post_text, score, feedback
-            else:
-                print(f"❌ POST REJECTED - Score: {score}, Has Hook: {has_hook}")
-                self.log_rejection(post_text, score, feedback, content_type)
+            rejected = (post_text, feedback)
         
         print(f"\n⚠️  Failed to generate acceptable post after {MAX_RETRIES} attempts")
         return None, 0, "Max retries exceeded"
 
+    def _generate_and_review_candidates(self, creator, reviewer, content_type, trending_topics):
+        """
+        Generate CANDIDATES_PER_REQUEST drafts in one request, then review
+        them in order until one is approved
+        """
+        print(f"\n{'='*80}")
+        print(f"Generating {CANDIDATES_PER_REQUEST} {content_type} candidates in one request...")
+        
+        candidates = creator.generate_candidates(
+            CANDIDATES_PER_REQUEST,
+            trending_topics=trending_topics,
+            self_learning_context=self.learning_context
+        )
+        
+        if not candidates:
+            print("Candidate generation failed")
+            return None, 0, "Candidate generation failed"
+        
+        candidates = [self._repair_draft(creator, c) for c in candidates]
+        candidates = [c for c in candidates if not self._prescreen_failures(reviewer, c, content_type)]
+        if not candidates:
+            print("\n⚠️  Every candidate failed the pre-review gate")
+            return None, 0, "No candidate passed the pre-review gate"
+        
+        if BATCH_REVIEW and len(candidates) > 1:
+            print(f"Reviewing {len(candidates)} candidates in one request...")
+            ranked = reviewer.evaluate_batch(candidates, content_type=content_type)
+            
+            # Best score first; the first one that also has a hook wins
+            for i, (post_text, score, feedback) in enumerate(ranked, 1):
+                print(f"\n{'-'*80}")
+                print(f"Ranked candidate {i}/{len(ranked)}")
+                print(f"Generated: {post_text}")
+                
+                if self._judge_draft(reviewer, post_text, score, feedback, content_type):
+                    return post_text, score, feedback
+        else:
+            for i, post_text in enumerate(candidates, 1):
+                print(f"\n{'-'*80}")
+                print(f"Candidate {i}/{len(candidates)}")
+                
+                print(f"Generated: {post_text}")
+                # Already prescreened above
+                score, feedback = reviewer.evaluate(post_text, content_type=content_type)
+                if self._judge_draft(reviewer, post_text, score, feedback, content_type):
+                    return post_text, score, feedback
+        
+        print(f"\n⚠️  None of {len(candidates)} candidates was acceptable")
+        return None, 0, "No candidate approved"
+
+    def _run_detached(self, coro):
+        """
+        Run a coroutine on a fresh event loop without waiting for abandoned calls
+        
+        Unlike asyncio.run, closing the loop does not join the worker threads
+        of calls that were cancelled (missed deadlines, unused speculation).
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    async def _run_pipelined(self, creator, reviewer, content_type, trending_topics):
+        """
+        Serial generate/review loop with generation of attempt N+1 overlapped
+        with the review of attempt N
+        
+        The speculative draft is cancelled once a draft is approved. A
+        speculative draft counts as used only if it becomes the approved post,
+        as rejected if it fails the gate or review, and as wasted if it is
+        never reviewed.
+        """
+        def start_generation():
+            return asyncio.create_task(creator.agenerate(
+                trending_topics=trending_topics,
+                self_learning_context=self.learning_context
+            ))
+        
+        used = rejected = wasted = 0
+        next_draft = start_generation()
+        try:
+            for attempt in range(MAX_RETRIES):
+                print(f"\n{'='*80}")
+                print(f"Attempt {attempt + 1}/{MAX_RETRIES} - Generating {content_type} post (pipelined)...")
+                post_text = await next_draft
+                # Every draft after the first was generated speculatively
+                speculative = attempt > 0
+                
+                # Speculatively start the next draft before reviewing this one
+                next_draft = start_generation() if attempt + 1 < MAX_RETRIES else None
+                
+                if not post_text:
+                    print(f"Generation failed on attempt {attempt + 1}")
+                    rejected += speculative
+                    continue
+                
+                repaired, repairs = await asyncio.to_thread(creator.repair, post_text)
+                post_text = self._log_repairs(post_text, repaired, repairs)
+                print(f"Generated: {post_text}")
+                if self._prescreen_failures(reviewer, post_text, content_type):
+                    rejected += speculative
+                    continue
+                
+                score, feedback = await reviewer.aevaluate(post_text, content_type=content_type)
+                if self._judge_draft(reviewer, post_text, score, feedback, content_type):
+                    used += speculative
+                    return post_text, score, feedback
+                rejected += speculative
+        finally:
+            if next_draft:
+                # Approved (or errored) with a speculative draft in flight; the
+                # request has already been sent, so its tokens are spent
+                wasted += 1
+                next_draft.cancel()
+                await asyncio.gather(next_draft, return_exceptions=True)
+            metrics.increment('pipeline.speculative_used', used)
+            metrics.increment('pipeline.speculative_rejected', rejected)
+            metrics.increment('pipeline.speculative_wasted', wasted)
+            print(f"🔮 Speculative drafts: {used} used, {rejected} rejected, {wasted} wasted")
+        
+        print(f"\n⚠️  Failed to generate acceptable post after {MAX_RETRIES} attempts")
+        return None, 0, "Max retries exceeded"
+
+    async def _run_tournament(self, creator, reviewer, content_type, trending_topics):
+        """
+        Generate and review TOURNAMENT_SIZE drafts concurrently and pick the
+        best approved one, so the wall time is that of the slowest draft
+        rather than the sum of serial attempts
+        """
+        print(f"\n{'='*80}")
+        print(f"🏆 Tournament: {TOURNAMENT_SIZE} {content_type} drafts, {TOURNAMENT_DEADLINE_S:.0f}s deadline...")
+        
+        start = time.monotonic()
+        tasks = [
+            asyncio.create_task(self._tournament_entry(creator, reviewer, content_type, trending_topics))
+            for _ in range(TOURNAMENT_SIZE)
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=TOURNAMENT_DEADLINE_S)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        metrics.observe('tournament.wall_s', time.monotonic() - start)
+        metrics.increment('tournament.timed_out', len(pending))
+        if pending:
+            print(f"⏱️  {len(pending)} draft(s) missed the deadline")
+        
+        entries = []
+        for task in done:
+            if task.exception():
+                print(f"Tournament draft failed: {task.exception()}")
+            elif task.result():
+                entries.append(task.result())
+        
+        approved = []
+        for post_text, score, feedback in entries:
+            print(f"\n{'-'*80}")
+            print(f"Generated: {post_text}")
+            if self._judge_draft(reviewer, post_text, score, feedback, content_type):
+                approved.append((post_text, score, feedback))
+        
+        if not approved:
+            print(f"\n⚠️  No tournament draft was approved ({len(entries)} reviewed)")
+            return None, 0, "No tournament draft approved"
+        
+        # Highest score wins; ties go to the draft least like anything already
+        # posted and least like the other top-scoring drafts
+        top_score = max(score for _, score, _ in approved)
+        top = [entry for entry in approved if entry[1] == top_score]
+        signatures = [signature(post_text) for post_text, _, _ in top]
+        
+        def redundancy(index):
+            peers = [similarity(signatures[index], other) for j, other in enumerate(signatures) if j != index]
+            return max([self._similarity_to_posted(top[index][0])] + peers)
+        
+        winner = top[min(range(len(top)), key=redundancy)]
+        metrics.increment('tournament.runners_up', len(approved) - 1)
+        print(f"\n🏆 Tournament winner (score {winner[1]}, {len(approved)} approved): {winner[0]}")
+        return winner
+
+    async def _tournament_entry(self, creator, reviewer, content_type, trending_topics):
+        """
+        Generate, gate and review one tournament draft
+        
+        Returns:
+            tuple: (post_text, score, feedback), or None if the draft was dropped
+        """
+        post_text = await creator.agenerate(
+            trending_topics=trending_topics,
+            self_learning_context=self.learning_context
+        )
+        if not post_text:
+            return None
+        repaired, repairs = await asyncio.to_thread(creator.repair, post_text)
+        post_text = self._log_repairs(post_text, repaired, repairs)
+        if self._prescreen_failures(reviewer, post_text, content_type):
+            return None
+        
+        score, feedback = await reviewer.aevaluate(post_text, content_type=content_type)
+        return post_text, score, feedback
+
+    def _similarity_to_posted(self, post_text):
+        """Estimated similarity to the closest past post (0 if none is close)"""
+        closest = self.dedupe.closest(post_text, sources=('posted',))
+        return closest[1] if closest else 0.0
+
+    def _review_draft(self, reviewer, post_text, content_type, revision=False):
+        """
+        Review one draft and log it if rejected
+        
+        Args:
+            revision (bool): The draft revises an earlier rejected draft
+        
+        Returns:
+            tuple: (approved: bool, score: int, feedback: str)
+        """
+        print(f"Generated: {post_text}")
+        print(f"Length: {tweet_length.weighted_length(post_text)} chars")
+        
+        failures = self._prescreen_failures(reviewer, post_text, content_type, revision=revision)
+        if failures:
+            return False, 0, f"Pre-review gate: {'; '.join(failures)}"
+        
+        # Review post
+        score, feedback = reviewer.evaluate(post_text, content_type=content_type)
+        
+        approved = self._judge_draft(reviewer, post_text, score, feedback, content_type)
+        return approved, score, feedback
+
+    def _repair_draft(self, creator, post_text):
+        """
+        Run the creator's local repair stage on a fresh draft
+        
+        Returns:
+            str: The repaired draft (unchanged if nothing needed fixing)
+        """
+        repaired, repairs = creator.repair(post_text)
+        return self._log_repairs(post_text, repaired, repairs)
+
+    def _log_repairs(self, original, repaired, repairs):
+        """Log which repairs were applied to a draft"""
+        if not repairs:
+            return repaired
+        
+        print(f"🔧 Repaired draft ({', '.join(repairs)}): {repaired}")
+        with self._state_lock:
+            # Keep only last 50 repairs
+            self.store.append('repairs', {
+                'timestamp': datetime.now().isoformat(),
+                'kinds': repairs,
+                'before': original,
+                'after': repaired
+            })
+            self._repaired_drafts.add(repaired)
+        return repaired
+
+    def _prescreen_failures(self, reviewer, post_text, content_type, revision=False):
+        """
+        Run the duplicate check and the local pre-review gate, logging the
+        draft as rejected if it fails either
+        
+        Args:
+            revision (bool): The draft revises a rejected draft, so it is only
+                checked against posted and queued posts (it keeps most of the
+                rejected draft's text by design)
+        
+        Returns:
+            list: Failure reasons (empty if the draft should go on to the reviewer)
+        """
+        reasons = []
+        if DEDUPE_ENABLED:
+            sources = ('posted', 'inventory') if revision else None
+            duplicate = self.dedupe.find_duplicate(post_text, sources=sources)
+            if duplicate:
+                entry, similarity = duplicate
+                reasons.append(f"{similarity:.0%} similar to {entry['source']} post {entry['text'][:60]!r}")
+        if PRE_REVIEW_GATE:
+            recent_posts = [entry.get('post_text', '') for entry in self.store.history(RECENT_POSTS_WINDOW)]
+            reasons += reviewer.prescreen(post_text, recent_posts=recent_posts)
+        with self._state_lock:
+            # Each repaired draft is checked by the gate once
+            repaired = post_text in self._repaired_drafts
+            self._repaired_drafts.discard(post_text)
+        if reasons:
+            print(f"🚫 PRE-REVIEW REJECTED - {'; '.join(reasons)}")
+            metrics.increment('review.prescreen_rejected')
+            self.log_rejection(post_text, 0, f"Pre-review gate: {'; '.join(reasons)}", content_type)
+        elif repaired:
+            # The gate would have sent the unrepaired draft back for regeneration
+            metrics.increment('repair.regenerations_avoided')
+        return reasons
+
+    def _judge_draft(self, reviewer, post_text, score, feedback, content_type):
+        """
+        Apply the approval gate to a reviewed draft and log it if rejected
+        
+        Returns:
+            bool: True if approved
+        """
+        print(f"\nReview Score: {score}/{MIN_SCORE_THRESHOLD}")
+        print(f"Feedback:\n{feedback}")
+        
+        # Check if post passes threshold AND has engagement hook
+        has_hook = self.has_engagement_hook(post_text)
+        print(f"Has engagement hook: {has_hook}")
+        
+        if reviewer.passes_threshold(score) and has_hook:
+            print(f"✅ POST APPROVED - Score: {score}, Has Hook: {has_hook}")
+            return True
+        
+        print(f"❌ POST REJECTED - Score: {score}, Has Hook: {has_hook}")
+        self.log_rejection(post_text, score, feedback, content_type)
+        return False
+
     def run_reply_cycle(self):
         """
         Check for mentions and reply to them with rate limiting
@@ -198,8 +513,10 @@ class EngagementBot:
         print(f"Found {len(mentions)} new mentions. Processing limits...")
         creator = CreatorAgent()
 
-        tracking = self.activity.get('reply_tracking', {})
-
+        # Decide which mentions get a reply before generating, so the
+        # per-thread limit also holds within this batch
+        planned = {}
+        to_reply = []
         for tweet in mentions:
             # Metadata for limiting
             author_id = str(tweet.author_id)
@@ -209,83 +526,111 @@ class EngagementBot:
             track_key = f"{conv_id}_{author_id}"
             
             # Check if we've already replied twice to this user in this thread
-            current_count = tracking.get(track_key, 0)
+            current_count = self.store.reply_count(conv_id, author_id) + planned.get(track_key, 0)
             
             if current_count >= 2:
                 print(f"⏹️  Skipping @{author_id} - Max replies (2) reached for this thread.")
-                self.last_mention_id = tweet.id
                 continue
 
-            reply_text = creator.generate_reply(tweet.text, "User")
+            planned[track_key] = planned.get(track_key, 0) + 1
+            to_reply.append(tweet)
+
+        # Generate all replies concurrently instead of one blocking call per mention
+        replies = asyncio.run(self._generate_replies(creator, to_reply))
+
+        for tweet in mentions:
+            reply_text = replies.get(tweet.id)
             if reply_text:
+                author_id = str(tweet.author_id)
+                conv_id = str(getattr(tweet, 'conversation_id', tweet.id))
+
                 print(f"Generated Reply to @{author_id}: {reply_text}")
                 url, error = self.x_handler.reply_to_tweet(tweet.id, reply_text)
                 if url:
                     print(f"✅ Replied successfully: {url}")
                     # Update tracking
-                    tracking[track_key] = current_count + 1
+                    with self._state_lock:
+                        self.store.incr_reply(conv_id, author_id)
                 else:
                     print(f"❌ Reply failed: {error}")
                 
-            self.last_mention_id = tweet.id
-            self.activity['last_mention_id'] = self.last_mention_id
-            self.activity['reply_tracking'] = tracking
-            self.save_activity_log()
+            with self._state_lock:
+                self.last_mention_id = tweet.id
+                self.store.set('last_mention_id', self.last_mention_id)
 
-    def run_learning_cycle(self):
+    async def _generate_replies(self, creator, tweets):
         """
-        Check metrics of past posts and adjust learning context
+        Generate replies for several mentions at once
+
+        Returns:
+            dict: tweet id -> reply text (None if generation failed)
         """
-        print("\n🧠 Running learning cycle...")
-        if not self.history:
-            return
+        results = await asyncio.gather(
+            *(creator.agenerate_reply(tweet.text, "User") for tweet in tweets)
+        )
+        return {tweet.id: reply for tweet, reply in zip(tweets, results)}
 
+    def collect_post_metrics(self):
+        """
+        Fetch engagement metrics for the latest posts and record pipeline metrics
+        """
+        print("\n📈 Collecting post metrics...")
+        collected = {}
         # Check latest 5 posts to see what gained traction
-        recent_posts = self.history[-5:]
-        top_performers = []
-
-        for post in recent_posts:
-            # We would normally use self.x_handler.get_tweet_metrics(post['id'])
-            # but for now we'll simulate or look for a 'url' that was saved
+        for post in self.store.history(5):
             # Extract ID from URL
             if 'url' in post:
                 tweet_id = post['url'].split('/')[-1]
-                metrics = self.x_handler.get_tweet_metrics(tweet_id)
-                if metrics:
-                    engagement = metrics.get('like_count', 0) + metrics.get('reply_count', 0) * 2
-                    if engagement >= 15: # User's threshold
-                        top_performers.append(f"Post: {post['post_text']} (Engagement: {engagement})")
+                tweet_metrics = self.x_handler.get_tweet_metrics(tweet_id)
+                if tweet_metrics:
+                    collected[tweet_id] = tweet_metrics
+        
+        with self._state_lock:
+            if collected:
+                self.store.set('post_metrics', collected)
+            self.save_metrics()
+        persistence.flush_all()
+    
+    def run_learning_cycle(self):
+        """
+        Check metrics of past posts and adjust learning context
+        """
+        print("\n🧠 Running learning cycle...")
+        post_metrics = self.store.get('post_metrics') or {}
+        top_performers = []
+
+        for post in self.store.history(5):
+            tweet_metrics = post_metrics.get(post.get('url', '').split('/')[-1])
+            if tweet_metrics:
+                engagement = tweet_metrics.get('like_count', 0) + tweet_metrics.get('reply_count', 0) * 2
+                if engagement >= 15: # User's threshold
+                    top_performers.append(f"Post: {post['post_text']} (Engagement: {engagement})")
 
         if top_performers:
             new_context = "\n".join(top_performers)
             self.learning_context = f"Users are engaging well with these types of takes:\n{new_context}"
-            self.activity['learning_context'] = self.learning_context
-            self.save_activity_log()
+            with self._state_lock:
+                self.store.set('learning_context', self.learning_context)
             print(f"✅ Learning updated with {len(top_performers)} successful patterns.")
         else:
             print("No high-engagement patterns found yet.")
     
     def log_rejection(self, post_text, score, feedback, content_type):
         """Log rejected post to activity"""
-        self.activity['total_rejections'] += 1
-        
-        rejection_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'content_type': content_type,
-            'post_text': post_text,
-            'score': score,
-            'feedback': feedback
-        }
+        with self._state_lock:
+            self.store.incr('total_rejections')
         
-        if 'rejections' not in self.activity:
-            self.activity['rejections'] = []
-        
-        # Keep only last 50 rejections
-        self.activity['rejections'].append(rejection_entry)
-        if len(self.activity['rejections']) > 50:
-            self.activity['rejections'] = self.activity['rejections'][-50:]
+            rejection_entry = {
+                'timestamp': datetime.now().isoformat(),
+                'content_type': content_type,
+                'post_text': post_text,
+                'score': score,
+                'feedback': feedback
+            }
         
-        self.save_activity_log()
+            # Keep only last 50 rejections
+            self.store.append('rejections', rejection_entry)
+        self.dedupe.add(post_text, 'rejected')
     
     def log_success(self, post_text, score, feedback, content_type, post_url):
         """Log successful post to history"""
@@ -298,41 +643,35 @@ class EngagementBot:
             'url': post_url
         }
         
-        self.history.append(success_entry)
-        self.save_posted_history()
+        with self._state_lock:
+            self.store.add_history(success_entry)
+            self.dedupe.add(post_text, 'posted')
         
-        self.activity['successful_posts'] += 1
-        self.activity['last_post_time'] = datetime.now().isoformat()
-        self.save_activity_log()
+            self.store.incr('successful_posts')
+            self.store.set('last_post_time', datetime.now().isoformat())
     
     def log_failure(self, post_text, error, content_type):
         """Log failed post attempt"""
-        self.activity['failed_posts'] += 1
-        
-        failure_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'content_type': content_type,
-            'post_text': post_text,
-            'error': str(error)
-        }
+        with self._state_lock:
+            self.store.incr('failed_posts')
         
-        if 'failures' not in self.activity:
-            self.activity['failures'] = []
-        
-        # Keep only last 50 failures
-        self.activity['failures'].append(failure_entry)
-        if len(self.activity['failures']) > 50:
-            self.activity['failures'] = self.activity['failures'][-50:]
+            failure_entry = {
+                'timestamp': datetime.now().isoformat(),
+                'content_type': content_type,
+                'post_text': post_text,
+                'error': str(error)
+            }
         
-        self.save_activity_log()
+            # Keep only last 50 failures
+            self.store.append('failures', failure_entry)
     
     def calculate_next_post_time(self):
         """Calculate random delay for next post (4-8 hours)"""
         delay_hours = random.uniform(POST_FREQUENCY_HOURS_MIN, POST_FREQUENCY_HOURS_MAX)
         next_post_time = datetime.now() + timedelta(hours=delay_hours)
         
-        self.activity['next_post_time'] = next_post_time.isoformat()
-        self.save_activity_log()
+        with self._state_lock:
+            self.store.set('next_post_time', next_post_time.isoformat())
         
         return delay_hours * 3600  # Convert to seconds
     
@@ -340,10 +679,10 @@ class EngagementBot:
         """
         Execute one posting cycle:
         1. Select content type
-        2. Get trending topics
-        3. Generate and review post
-        4. Post if approved
-        5. Log results
+        2. Take an approved post from the inventory, or
+           get trending topics and generate and review a post
+        3. Post if approved
+        4. Log results
         """
         print(f"\n{'='*80}")
         print(f"🚀 STARTING POSTING CYCLE at {datetime.now().isoformat()}")
@@ -353,28 +692,28 @@ class EngagementBot:
         content_type = self.select_content_type()
         print(f"Content type selected: {content_type}")
         
-        # Get current trending topics + Real-time news
-        print("\nFetching trending topics and real-world news...")
-        trending_topics = self.x_handler.get_tech_trends(count=3)
-        real_news = self.news_monitor.get_top_tech_news(limit=3)
-        
-        combined_context = trending_topics + real_news
-        print(f"Combined Context: {combined_context}")
-        
-        # Filter for fresh topics
-        selected_topics = [t for t in combined_context if self.trending_manager.is_fresh_topic(t)]
-        if not selected_topics:
-            selected_topics = self.trending_manager.get_topic_suggestions()[:3]
-        
-        print(f"Selected topics for generation: {selected_topics}")
-        
-        # Generate and review post with learning context
-        post_text, score, feedback = self.generate_and_review_post(content_type, selected_topics)
+        # Publish a pre-approved post from the inventory when one is on hand
+        entry = self.inventory.take(content_type) if self.inventory else None
+        if entry:
+            print(f"📦 Using inventory post from {entry['created_at']} ({self.inventory.depth()} left)")
+            post_text, score, feedback = entry['post_text'], entry['score'], entry['feedback']
+            selected_topics = entry['topics']
+        else:
+            selected_topics = self._select_topics()
+            post_text, score, feedback = self._produce_post(content_type, selected_topics)
         
         if post_text is None:
             print("\n❌ CYCLE FAILED - Could not generate acceptable post")
             return False
         
+        # X rejects duplicate content, so check against what was actually posted
+        duplicate = self.dedupe.find_duplicate(post_text, sources=('posted',)) if DEDUPE_ENABLED else None
+        if duplicate:
+            entry, similarity = duplicate
+            print(f"\n🚫 NOT POSTING - {similarity:.0%} similar to post from {entry['timestamp']}")
+            self.log_failure(post_text, f"Near-duplicate of posted tweet: {entry['text'][:60]!r}", content_type)
+            return False
+        
         # Attempt to post to X
         print(f"\n📤 Attempting to post to X...")
         try:
@@ -392,8 +731,8 @@ class EngagementBot:
                 for topic in selected_topics:
                     self.trending_manager.add_topic(topic)
                 
-                self.activity['total_posts'] += 1
-                self.save_activity_log()
+                with self._state_lock:
+                    self.store.incr('total_posts')
                 
                 return True
             else:
@@ -406,9 +745,98 @@ class EngagementBot:
             self.log_failure(post_text, e, content_type)
             return False
     
+    def _select_topics(self):
+        """
+        Fetch trending topics and news and keep the ones not used recently
+        
+        Returns:
+            list: Topics for generation
+        """
+        # Get current trending topics + Real-time news
+        print("\nFetching trending topics and real-world news...")
+        trending_topics = self.x_handler.get_tech_trends(count=3)
+        real_news = self.news_monitor.get_top_tech_news(limit=3)
+        
+        combined_context = trending_topics + real_news
+        print(f"Combined Context: {combined_context}")
+        
+        # Filter for fresh topics
+        selected_topics = [t for t in combined_context if self.trending_manager.is_fresh_topic(t)]
+        if not selected_topics:
+            selected_topics = self.trending_manager.get_topic_suggestions()[:3]
+        
+        print(f"Selected topics for generation: {selected_topics}")
+        return selected_topics
+
+    def _produce_post(self, content_type, topics):
+        """
+        Generate and review one post, recording cycle metrics
+        
+        Returns:
+            tuple: (post_text, score, feedback) - post_text is None if nothing was approved
+        """
+        # Generate and review post with learning context
+        cycle_start = time.monotonic()
+        # Counted per cycle: replies and the inventory producer call xAI concurrently
+        with metrics.tally() as counts:
+            post_text, score, feedback = self.generate_and_review_post(content_type, topics)
+        metrics.observe('cycle.generate_review_s', time.monotonic() - cycle_start)
+        metrics.increment('cycle.approved' if post_text else 'cycle.no_post')
+        if post_text:
+            # Drafts and LLM calls it took to get this approved post (retries included)
+            metrics.observe('cycle.drafts_per_approved', counts['creator.drafts'])
+            metrics.observe('cycle.llm_calls_per_approved', counts['xai.calls'])
+        return post_text, score, feedback
+
+    def run_inventory_producer(self):
+        """
+        Keep the inventory at its target depth (runs on a background thread)
+        
+        Produces for whichever content type is furthest below target, then
+        idles while the inventory is full.
+        """
+        print(f"📦 Inventory producer started (target {self.inventory.target_depth} per type)")
+        while not self._producer_stop.is_set():
+            try:
+                content_type = self.inventory.most_needed(['controversial', 'relatable'])
+                if content_type is None:
+                    self._producer_stop.wait(INVENTORY_REFILL_INTERVAL_S)
+                    continue
+                
+                print(f"\n📦 Producing {content_type} post for inventory...")
+                topics = self._select_topics()
+                post_text, score, feedback = self._produce_post(content_type, topics)
+                if post_text:
+                    self.inventory.add(post_text, score, feedback, content_type, topics)
+                    # Later drafts must not repeat a post that is waiting in the inventory
+                    self.dedupe.add(post_text, 'inventory')
+                else:
+                    self._producer_stop.wait(INVENTORY_RETRY_S)
+            except Exception as e:
+                print(f"\n⚠️  Inventory producer error: {e}")
+                self._producer_stop.wait(INVENTORY_RETRY_S)
+
+    def run_post_job(self):
+        """
+        Post, then schedule the next post
+        
+        Returns:
+            datetime: When the post job should run next
+        """
+        print("\n🕒 Time for a new post!")
+        self.run_posting_cycle()
+        self.calculate_next_post_time()
+        next_post = self.store.get('next_post_time')
+        print(f"Next post scheduled for: {next_post}")
+        with self._state_lock:
+            self.save_metrics()
+        # One write per changed file per cycle (topics, dedupe index, cache, ...)
+        persistence.flush_all()
+        return datetime.fromisoformat(next_post)
+
     def run(self):
         """
-        Main bot loop - runs indefinitely with dynamic cycles
+        Main bot loop - runs indefinitely, each job at its own due time
         """
         print(f"\n{'='*80}")
         print("🔥 DEVUNFILTERED BOT IS ONLINE")
@@ -416,49 +844,40 @@ class EngagementBot:
         print(f"Posting frequency: {POST_FREQUENCY_HOURS_MIN}-{POST_FREQUENCY_HOURS_MAX} hours")
         print(f"{'='*80}\n")
         
-        while True:
-            try:
-                # 1. ALWAYS check for mentions and reply first
-                self.run_reply_cycle()
-                
-                # 2. Determine if it's time to post
-                now = datetime.now()
-                next_post_str = self.activity.get('next_post_time')
-                
-                should_post = False
-                if not next_post_str:
-                    should_post = True
-                else:
-                    next_post = datetime.fromisoformat(next_post_str)
-                    if now >= next_post:
-                        should_post = True
-                
-                if should_post:
-                    print("\n🕒 Time for a new post!")
-                    success = self.run_posting_cycle()
-                    
-                    # 3. Run learning cycle to analyze recent performance
-                    self.run_learning_cycle()
-                    
-                    # 4. Schedule next post
-                    delay_seconds = self.calculate_next_post_time()
-                    print(f"Next post scheduled for: {self.activity['next_post_time']}")
-                
-                # Sleep in 5-minute increments to stay reactive to replies
-                # while waiting for the next scheduled post
-                print("... (Idle: Checking mentions again in 5 mins) ...")
-                time.sleep(300) # 5 minutes
-                
-            except KeyboardInterrupt:
-                print("\n\n🛑 Bot stopped by user")
-                break
-            except Exception as e:
-                print(f"\n⚠️  Unexpected error in main loop: {e}")
-                time.sleep(60) # Wait a bit before retry
+        persistence.start_flusher()
+        if self.inventory:
+            threading.Thread(target=self.run_inventory_producer, name='inventory-producer', daemon=True).start()
+        
+        # Jobs resume at the times saved before a restart
+        self.scheduler = Scheduler(self.store, lanes={
+            'reply': REPLY_LANE_WORKERS,
+            'background': BACKGROUND_LANE_WORKERS
+        })
+        next_post = self.store.get('next_post_time')
+        self.scheduler.add(Job('mentions', self.run_reply_cycle, MENTION_POLL_INTERVAL_S, MENTION_POLL_JITTER_S,
+                               lane='reply'))
+        self.scheduler.add(Job('post', self.run_post_job, lane='background'),
+                           first_run=datetime.fromisoformat(next_post) if next_post else None)
+        self.scheduler.add(Job('metrics', self.collect_post_metrics, METRICS_INTERVAL_S, METRICS_JITTER_S,
+                               lane='background'))
+        self.scheduler.add(Job('learning', self.run_learning_cycle, LEARNING_INTERVAL_S, LEARNING_JITTER_S,
+                               lane='background'),
+                           first_run=datetime.now() + timedelta(seconds=LEARNING_INTERVAL_S))
+        
+        try:
+            self.scheduler.run_forever()
+        except KeyboardInterrupt:
+            print("\n\n🛑 Bot stopped by user")
+            self._producer_stop.set()
+            with self._state_lock:
+                self.store.close()
+            persistence.stop_flusher()
 
 
 def main():
     """Entry point for bot"""
+    # Seed and isolate record/replay runs before any state is loaded
+    transport.start_run()
     bot = EngagementBot()
     bot.run()
 
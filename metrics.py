@@ -0,0 +1,121 @@
+"""
+Process-wide counters and latency samples for the bot pipeline
+Snapshots are saved into the bot state (state_store.py) and shown on the dashboard
+"""
+
+import threading
+import contextvars
+from contextlib import contextmanager
+from collections import defaultdict, deque
+
+# Keep a bounded window of recent samples per metric
+MAX_SAMPLES = 500
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+# Counter increments made inside tally(); asyncio tasks and to_thread calls
+# inherit it, other threads do not
+_tally = contextvars.ContextVar('metrics_tally', default=None)
+
+
+def increment(name, amount=1):
+    """
+    Add to a named counter
+
+    Args:
+        name (str): Counter name, e.g. 'xai.calls'
+        amount (int): Amount to add
+    """
+    counts = _tally.get()
+    with _lock:
+        _counters[name] += amount
+        if counts is not None:
+            counts[name] += amount
+
+
+@contextmanager
+def tally():
+    """
+    Count the increments made by the current thread (and the tasks it starts)
+
+    Yields:
+        defaultdict: Counter name -> amount added inside the block
+    """
+    counts = defaultdict(int)
+    token = _tally.set(counts)
+    try:
+        yield counts
+    finally:
+        _tally.reset(token)
+
+
+def observe(name, value):
+    """
+    Record one sample (usually a latency in seconds)
+
+    Args:
+        name (str): Metric name, e.g. 'xai.total_s'
+        value (float): Sample value
+    """
+    if value is None:
+        return
+    with _lock:
+        _samples[name].append(value)
+
+
+def get_counter(name):
+    """Return the current value of a counter"""
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def percentile(name, pct):
+    """
+    Return the pct-th percentile of recent samples
+
+    Args:
+        name (str): Metric name
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value, or None if there are no samples
+    """
+    with _lock:
+        values = sorted(_samples.get(name, ()))
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def sample_count(name):
+    """Return how many recent samples are held for a metric"""
+    with _lock:
+        return len(_samples.get(name, ()))
+
+
+def snapshot():
+    """
+    Summarise all metrics for persistence
+
+    Returns:
+        dict: {'counters': {...}, 'latency': {name: {count, p50, p95, last}}}
+    """
+    with _lock:
+        counters = dict(_counters)
+        samples = {name: list(values) for name, values in _samples.items()}
+
+    latency = {}
+    for name, values in samples.items():
+        if not values:
+            continue
+        ordered = sorted(values)
+        latency[name] = {
+            'count': len(values),
+            'p50': round(ordered[len(ordered) // 2], 3),
+            'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            'last': round(values[-1], 3),
+        }
+
+    return {'counters': counters, 'latency': latency}
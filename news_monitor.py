@@ -2,6 +2,8 @@ import requests
 import heapq
 from datetime import datetime, timedelta
 
+import transport
+
 class NewsMonitor:
     """
     Monitors real-time tech news sources:
@@ -11,6 +13,8 @@ class NewsMonitor:
     
     def __init__(self):
         self.hn_api_url = "https://hacker-news.firebaseio.com/v0"
+        # Record/replay cassettes when TRANSPORT_MODE is set (see transport.py)
+        self.session = transport.install(requests.Session(), 'news')
     
     def get_top_tech_news(self, limit=5):
         """
@@ -28,7 +32,7 @@ class NewsMonitor:
         """
         try:
             # Get top story IDs
-            resp = requests.get(f"{self.hn_api_url}/topstories.json")
+            resp = self.session.get(f"{self.hn_api_url}/topstories.json")
             if resp.status_code != 200:
                 print(f"⚠️ HN API Error: {resp.status_code}")
                 return []
@@ -40,7 +44,7 @@ class NewsMonitor:
                 if len(stories) >= limit:
                     break
                     
-                item_resp = requests.get(f"{self.hn_api_url}/item/{item_id}.json")
+                item_resp = self.session.get(f"{self.hn_api_url}/item/{item_id}.json")
                 if item_resp.status_code == 200:
                     item = item_resp.json()
                     # Filter for relevance if possible, but HN Top is usually relevant
@@ -68,7 +72,7 @@ class NewsMonitor:
             
             url = f"https://api.github.com/search/repositories?q={query}&sort=stars&order=desc"
             
-            resp = requests.get(url, headers={'Accept': 'application/vnd.github.v3+json'})
+            resp = self.session.get(url, headers={'Accept': 'application/vnd.github.v3+json'})
             
             if resp.status_code != 200:
                 print(f"⚠️ GitHub API Error: {resp.status_code}")
@@ -0,0 +1,164 @@
+"""
+Atomic, coalesced persistence for the JSON state files
+Writers mark themselves dirty and are flushed together (once per bot cycle
+and on a timer); every write goes to a temp file that replaces the original,
+so readers like the dashboard never see a half-written file
+"""
+
+import os
+import json
+import atexit
+import tempfile
+import threading
+
+import metrics
+
+# 'full' (fsync every write and the directory), 'file' (fsync every write,
+# including each appended event), 'batch' (fsync rewritten files such as
+# snapshots; appended events are fsynced together on the next flush) or 'off'
+# (leave it to the OS; a power loss can lose recent writes but never tear a file)
+PERSIST_FSYNC = os.getenv('PERSIST_FSYNC', 'batch').lower()
+# Dirty files are also flushed this often, for writers outside the main loop
+PERSIST_FLUSH_INTERVAL_S = float(os.getenv('PERSIST_FLUSH_INTERVAL_S', 30))
+
+_registry = []
+_registry_lock = threading.Lock()
+_flusher_stop = threading.Event()
+
+
+def fsync_file(f):
+    """Flush a rewritten file object to disk according to PERSIST_FSYNC"""
+    f.flush()
+    if PERSIST_FSYNC != 'off':
+        os.fsync(f.fileno())
+
+
+def fsync_append(f):
+    """
+    Flush an appended record; only 'full' and 'file' fsync every append
+
+    Returns:
+        bool: True if the record still needs an fsync (PERSIST_FSYNC is 'batch')
+    """
+    f.flush()
+    if PERSIST_FSYNC in ('full', 'file'):
+        os.fsync(f.fileno())
+    return PERSIST_FSYNC == 'batch'
+
+
+def atomic_write(path, content):
+    """
+    Replace a file's contents atomically
+
+    Args:
+        path (str): Destination file
+        content (str): New contents
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            fsync_file(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    if PERSIST_FSYNC == 'full':
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    metrics.increment('persist.writes')
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Serialize data as JSON and write it atomically (json.dumps kwargs pass through)"""
+    atomic_write(path, json.dumps(data, **dump_kwargs))
+
+
+class DirtyFlag:
+    """
+    Coalesces saves of one file: mark_dirty() is cheap, flush() writes at most once
+    """
+
+    def __init__(self, save, name):
+        """
+        Initialize DirtyFlag and register it for flush_all()
+
+        Args:
+            save (callable): Writes the file (should use atomic_write)
+            name (str): Name used in metrics, e.g. 'dedupe'
+        """
+        self.save = save
+        self.name = name
+        self.dirty = False
+        # Serializes flushes from the main loop, the timer and atexit
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def mark_dirty(self):
+        """Record that the file needs writing"""
+        self.dirty = True
+        metrics.increment(f'persist.{self.name}.marks')
+
+    def flush(self):
+        """
+        Write the file if it changed since the last flush
+
+        Returns:
+            bool: True if the file was written
+        """
+        with self._lock:
+            if not self.dirty:
+                return False
+            # Cleared first so changes made during the save mark it dirty again
+            self.dirty = False
+            try:
+                self.save()
+            except Exception:
+                self.dirty = True
+                raise
+            metrics.increment(f'persist.{self.name}.flushes')
+            return True
+
+
+def flush_all():
+    """
+    Write every dirty file once
+
+    Returns:
+        int: Number of files written
+    """
+    with _registry_lock:
+        flags = list(_registry)
+    written = 0
+    for flag in flags:
+        try:
+            written += flag.flush()
+        except Exception as e:
+            print(f"⚠️  Could not save {flag.name}: {e}")
+    return written
+
+
+def start_flusher(interval=PERSIST_FLUSH_INTERVAL_S):
+    """Flush dirty files every `interval` seconds on a daemon thread"""
+    def run():
+        while not _flusher_stop.wait(interval):
+            flush_all()
+    threading.Thread(target=run, name='persist-flusher', daemon=True).start()
+
+
+def stop_flusher():
+    """Stop the timer and write whatever is still dirty"""
+    _flusher_stop.set()
+    flush_all()
+
+
+# Nothing marked dirty is lost on a normal exit
+atexit.register(flush_all)
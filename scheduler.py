@@ -0,0 +1,251 @@
+"""
+Heap-based job scheduler for the bot's recurring work
+Sleeps until the next job is due (no polling) and persists each job's next
+run time so schedules survive restarts. Due jobs are handed to priority
+lanes, each with its own workers, so slow background work never delays
+latency-sensitive jobs
+"""
+
+import time
+import heapq
+import queue
+import random
+import itertools
+import threading
+from datetime import datetime
+
+import metrics
+
+# Delay before retrying a job that raised
+JOB_RETRY_S = 60
+
+
+class Job:
+    """
+    A named callable with its own interval and jitter
+    """
+
+    def __init__(self, name, func, interval_s=None, jitter_s=0, lane=None):
+        """
+        Initialize Job
+
+        Args:
+            name (str): Unique job name, also the key in the persisted schedule
+            func (callable): Work to run; may return a datetime to override the next run
+            interval_s (float): Seconds between runs (None for jobs that set their own time)
+            jitter_s (float): Up to this many random seconds are added to each interval
+            lane (str): Lane that runs the job (None runs it in the scheduler thread)
+        """
+        self.name = name
+        self.func = func
+        self.interval_s = interval_s
+        self.jitter_s = jitter_s
+        self.lane = lane
+
+    def next_after(self, now):
+        """Epoch time of the next run after one finishing at `now`"""
+        return now + (self.interval_s or 0) + random.uniform(0, self.jitter_s)
+
+
+class Lane:
+    """
+    A queue of due jobs with its own worker threads
+    """
+
+    def __init__(self, name, workers, run, on_error):
+        """
+        Initialize Lane and start its workers
+
+        Args:
+            name (str): Lane name, used in metrics ('reply', 'background', ...)
+            workers (int): Jobs the lane runs at the same time
+            run (callable): Called as run(job, lateness) by a worker
+            on_error (callable): Called as on_error(job) if run raises, so the
+                job is not lost
+        """
+        self.name = name
+        self.run = run
+        self.on_error = on_error
+        self.queue = queue.Queue()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f'lane-{name}-{i}', daemon=True).start()
+
+    def submit(self, job, due):
+        """
+        Queue a due job
+
+        Args:
+            job (Job): Job to run
+            due (float): Epoch time it was due (wait time is measured from it)
+        """
+        self.queue.put((job, due))
+        metrics.increment(f'lane.{self.name}.queued')
+        metrics.observe(f'lane.{self.name}.depth', self.queue.qsize())
+
+    def _work(self):
+        while True:
+            job, due = self.queue.get()
+            # Time from due to started: scheduling delay plus time spent queued
+            wait = max(time.time() - due, 0)
+            # A worker that dies would stop the lane for good
+            try:
+                metrics.observe(f'lane.{self.name}.wait_s', wait)
+                self.run(job, wait)
+            except Exception as e:
+                print(f"\n⚠️  Lane {self.name} error running {job.name}: {e}")
+                self.on_error(job)
+
+
+class Scheduler:
+    """
+    Runs jobs at their due times in the calling thread, earliest first
+    """
+
+    def __init__(self, store=None, lanes=None):
+        """
+        Initialize Scheduler
+
+        Args:
+            store: State store (state_store/sqlite_store); next run times are
+                saved under 'schedule' and reloaded on start
+            lanes (dict): Lane name -> worker count
+        """
+        self.store = store
+        self.jobs = {}
+        self.lanes = {
+            name: Lane(name, workers, self._run, self._retry)
+            for name, workers in (lanes or {}).items()
+        }
+        self._heap = []
+        # Current due time per job; heap entries that disagree are stale
+        self._due = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._restored = dict(store.get('schedule') or {}) if store else {}
+
+    def add(self, job, first_run=None):
+        """
+        Schedule a job
+
+        The first run is the time saved before a restart if there is one,
+        otherwise first_run, otherwise now.
+
+        Args:
+            job (Job): Job to add
+            first_run (datetime): When to run it first
+        """
+        self.jobs[job.name] = job
+        saved = self._restored.get(job.name)
+        if saved:
+            when = datetime.fromisoformat(saved).timestamp()
+        elif first_run:
+            when = first_run.timestamp()
+        else:
+            when = time.time()
+        self._push(job.name, when)
+
+    def reschedule(self, name, when):
+        """
+        Move a job to a new time (wakes the loop if it is sleeping)
+
+        Args:
+            name (str): Job name
+            when (datetime): New run time
+        """
+        self._push(name, when.timestamp())
+
+    def _push(self, name, when):
+        with self._lock:
+            self._due[name] = when
+            heapq.heappush(self._heap, (when, next(self._counter), name))
+        self._wakeup.set()
+
+    def _retry(self, job):
+        """Put a job back on the heap after an error, unless it already is"""
+        with self._lock:
+            scheduled = job.name in self._due
+        if not scheduled:
+            self._push(job.name, time.time() + JOB_RETRY_S)
+
+    def _save(self):
+        """Persist every job's next run time"""
+        if self.store:
+            with self._lock:
+                schedule = {name: datetime.fromtimestamp(when).isoformat() for name, when in self._due.items()}
+            # The in-memory schedule is still right; the next save catches up
+            try:
+                self.store.set('schedule', schedule)
+            except Exception as e:
+                print(f"\n⚠️  Could not save schedule: {e}")
+
+    def _pop_due(self):
+        """
+        Pop the next job if it is due
+
+        Returns:
+            tuple: (job name or None, seconds until the next job or None if idle,
+                seconds the popped job is late)
+        """
+        with self._lock:
+            while self._heap:
+                when, _, name = self._heap[0]
+                if self._due.get(name) != when:
+                    # Superseded by a reschedule
+                    heapq.heappop(self._heap)
+                    continue
+                delay = when - time.time()
+                if delay > 0:
+                    return None, delay, 0
+                heapq.heappop(self._heap)
+                del self._due[name]
+                return name, 0, -delay
+            return None, None, 0
+
+    def next_run(self, name):
+        """Return a job's next run time (datetime), or None if it is not scheduled"""
+        with self._lock:
+            when = self._due.get(name)
+        return datetime.fromtimestamp(when) if when else None
+
+    def run_forever(self):
+        """Run due jobs until stop() is called, sleeping until the next one is due"""
+        self._save()
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            name, delay, lateness = self._pop_due()
+            if name is None:
+                # Returns early if a job is added or rescheduled meanwhile
+                self._wakeup.wait(delay)
+                continue
+
+            job = self.jobs[name]
+            if job.lane:
+                # The job is off the heap until it finishes, so it never overlaps itself
+                self.lanes[job.lane].submit(job, time.time() - lateness)
+            else:
+                self._run(job, lateness)
+
+    def _run(self, job, lateness):
+        """Run one job and schedule its next run (called by the loop or a lane worker)"""
+        start = time.monotonic()
+        next_run = None
+        try:
+            metrics.observe(f'scheduler.{job.name}.lateness_s', lateness)
+            override = job.func()
+            next_run = override.timestamp() if isinstance(override, datetime) else job.next_after(time.time())
+            metrics.increment(f'scheduler.{job.name}.runs')
+        except Exception as e:
+            print(f"\n⚠️  Job {job.name} failed: {e}")
+            metrics.increment(f'scheduler.{job.name}.errors')
+        finally:
+            # Back on the heap before anything else can fail
+            self._push(job.name, next_run or time.time() + JOB_RETRY_S)
+        metrics.observe(f'scheduler.{job.name}.duration_s', time.monotonic() - start)
+        self._save()
+
+    def stop(self):
+        """Stop run_forever() after the current job"""
+        self._stop.set()
+        self._wakeup.set()
@@ -0,0 +1,336 @@
+"""
+SQLite (WAL) backend for bot state, posted history, topics and reply tracking
+Same interface as state_store.StateStore, with indexed lookups for the
+freshness checks, stats and dashboard queries
+
+Run directly to import the existing JSON state and the *_legacy.json files:
+    python sqlite_store.py
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+import transport
+from persistence import PERSIST_FSYNC
+from state_store import DEFAULT_ACTIVITY, DEFAULT_LIST_LIMIT, load_state, _read_json
+
+STATE_DB_FILE = transport.state_path(os.getenv('STATE_DB_FILE', 'bot_state.db'))
+
+TOPIC_HISTORY = 'topic_history.json'
+LEGACY_ACTIVITY_LOG = 'bot_activity_legacy.json'
+LEGACY_POSTED_HISTORY = 'posted_history_legacy.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    timestamp TEXT,
+    content_type TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_kind_id ON events (kind, id);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    content_type TEXT,
+    tweet_id TEXT,
+    post_text TEXT,
+    score INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_timestamp ON posts (timestamp);
+CREATE INDEX IF NOT EXISTS posts_content_type ON posts (content_type, timestamp);
+CREATE INDEX IF NOT EXISTS posts_tweet_id ON posts (tweet_id);
+CREATE TABLE IF NOT EXISTS replies (
+    conversation_id TEXT NOT NULL,
+    author_id TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    PRIMARY KEY (conversation_id, author_id)
+);
+CREATE TABLE IF NOT EXISTS topics (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS topics_topic ON topics (topic COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS topics_timestamp ON topics (timestamp);
+"""
+
+
+def _tweet_id(url):
+    """Tweet id from a post URL (None if there is no URL)"""
+    return url.rstrip('/').split('/')[-1] if url else None
+
+
+class SQLiteStore:
+    """
+    Bot state in one SQLite database
+
+    Scalars and counters live in a key/value table; rejections, failures and
+    repairs are rows of one events table; posts, topics and reply counts have
+    their own indexed tables. Every entry is kept, so the list limits of the
+    JSON backend only bound what recent() returns.
+    """
+
+    def __init__(self, db_file=STATE_DB_FILE, readonly=False):
+        """
+        Initialize SQLiteStore
+
+        Args:
+            db_file (str): Path to the SQLite database
+            readonly (bool): Open without write access (the dashboard reads while the bot writes)
+        """
+        self.db_file = db_file
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(db_file, check_same_thread=False)
+            # WAL lets the dashboard read while the bot writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(f"PRAGMA synchronous={'FULL' if PERSIST_FSYNC == 'full' else 'NORMAL'}")
+            self.conn.executescript(SCHEMA)
+        # The inventory producer thread shares the connection with the main loop
+        self._lock = threading.RLock()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def get(self, key, default=None):
+        """Return an activity value"""
+        rows = self._query("SELECT value FROM kv WHERE key = ?", (key,))
+        return json.loads(rows[0][0]) if rows else DEFAULT_ACTIVITY.get(key, default)
+
+    def set(self, key, value):
+        """Set an activity value"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO kv (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value, ensure_ascii=False))
+            )
+
+    def incr(self, key, amount=1):
+        """Add to an activity counter"""
+        with self._lock:
+            self.set(key, (self.get(key) or 0) + amount)
+
+    def append(self, key, entry, limit=DEFAULT_LIST_LIMIT):
+        """
+        Append to an activity list (e.g. 'rejections')
+
+        Args:
+            key (str): List name
+            entry (dict): Entry to append
+            limit (int): Unused; every entry is kept
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO events (kind, timestamp, content_type, data) VALUES (?, ?, ?, ?)",
+                (key, entry.get('timestamp'), entry.get('content_type'),
+                 json.dumps(entry, ensure_ascii=False))
+            )
+
+    def recent(self, key, n=None):
+        """Return the last n entries of an activity list (DEFAULT_LIST_LIMIT if n is None)"""
+        rows = self._query(
+            "SELECT data FROM events WHERE kind = ? ORDER BY id DESC LIMIT ?",
+            (key, n or DEFAULT_LIST_LIMIT)
+        )
+        return [json.loads(data) for data, in reversed(rows)]
+
+    def add_history(self, entry):
+        """Record a posted tweet"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO posts (timestamp, content_type, tweet_id, post_text, score, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (entry.get('timestamp'), entry.get('content_type'), _tweet_id(entry.get('url')),
+                 entry.get('post_text'), entry.get('score'), json.dumps(entry, ensure_ascii=False))
+            )
+
+    def history(self, n=None):
+        """Return the last n posted tweets (all if n is None)"""
+        rows = self._query("SELECT data FROM posts ORDER BY id DESC LIMIT ?", (n or -1,))
+        return [json.loads(data) for data, in reversed(rows)]
+
+    def content_type_counts(self):
+        """
+        Posted tweets per content type
+
+        Returns:
+            dict: content_type -> count
+        """
+        return dict(self._query("SELECT content_type, COUNT(*) FROM posts GROUP BY content_type"))
+
+    def reply_count(self, conversation_id, author_id):
+        """Replies sent in one conversation to one author"""
+        rows = self._query(
+            "SELECT count FROM replies WHERE conversation_id = ? AND author_id = ?",
+            (str(conversation_id), str(author_id))
+        )
+        return rows[0][0] if rows else 0
+
+    def incr_reply(self, conversation_id, author_id):
+        """Count a reply sent in one conversation to one author"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO replies (conversation_id, author_id, count, updated_at) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (conversation_id, author_id) DO UPDATE SET "
+                "count = count + 1, updated_at = excluded.updated_at",
+                (str(conversation_id), str(author_id), datetime.now().isoformat())
+            )
+
+    def add_topic(self, topic, timestamp=None):
+        """Record a topic used in a post"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO topics (topic, timestamp) VALUES (?, ?)",
+                (topic, timestamp or datetime.now().isoformat())
+            )
+
+    def recent_topics(self, n=None):
+        """Return the last n topic entries (all if n is None), oldest first"""
+        rows = self._query("SELECT topic, timestamp FROM topics ORDER BY id DESC LIMIT ?", (n or -1,))
+        return [{'topic': topic, 'timestamp': timestamp} for topic, timestamp in reversed(rows)]
+
+    def topic_used_recently(self, topic, window):
+        """Return True if topic is among the last `window` topics (case-insensitive)"""
+        rows = self._query(
+            "SELECT 1 FROM (SELECT topic FROM topics ORDER BY id DESC LIMIT ?) "
+            "WHERE topic = ? COLLATE NOCASE LIMIT 1",
+            (window, topic)
+        )
+        return bool(rows)
+
+    def topic_counts(self, window=None):
+        """
+        Usage count per topic over the last `window` topics (all if None)
+
+        Returns:
+            list: (topic, count) tuples, most used first
+        """
+        return self._query(
+            "SELECT topic, COUNT(*) AS uses FROM "
+            "(SELECT topic FROM topics ORDER BY id DESC LIMIT ?) "
+            "GROUP BY topic ORDER BY uses DESC, topic",
+            (window or -1,)
+        )
+
+    def clear_topics(self):
+        """Delete all topic history"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM topics")
+
+    def activity(self):
+        """
+        All activity values plus the recent rejections, failures and repairs
+
+        Returns:
+            dict: Same shape as the JSON backend's activity
+        """
+        activity = json.loads(json.dumps(DEFAULT_ACTIVITY))
+        activity.update({key: json.loads(value) for key, value in self._query("SELECT key, value FROM kv")})
+        for key in ('rejections', 'failures', 'repairs'):
+            activity[key] = self.recent(key)
+        return activity
+
+    def compact(self):
+        """Fold the write-ahead log back into the database file"""
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Checkpoint and close the database"""
+        self.compact()
+        self.conn.close()
+
+
+def import_json(store):
+    """
+    One-shot import of the JSON state files into a SQLiteStore
+
+    Brings in the legacy bot's posted_history_legacy.json (posts) and
+    bot_activity_legacy.json (rejections and posting errors), then the current
+    state (event log snapshot or bot_activity.json / posted_history.json)
+    and topic_history.json. Does nothing if the database was already imported.
+
+    Args:
+        store (SQLiteStore): Destination store
+
+    Returns:
+        dict: Number of rows imported per kind
+    """
+    if store.get('imported_at'):
+        print(f"Already imported on {store.get('imported_at')}")
+        return {}
+
+    counts = {'posts': 0, 'rejections': 0, 'failures': 0, 'topics': 0}
+
+    # Legacy entries are older than anything the current bot wrote, so they go first
+    legacy_posts = _read_json(LEGACY_POSTED_HISTORY) or []
+    for entry in legacy_posts:
+        store.add_history({
+            'timestamp': entry.get('timestamp'),
+            'content_type': entry.get('type', 'unknown').lower(),
+            'post_text': entry.get('content'),
+            'legacy': True
+        })
+        counts['posts'] += 1
+
+    for entry in _read_json(LEGACY_ACTIVITY_LOG) or []:
+        common = {
+            'timestamp': entry.get('timestamp'),
+            'content_type': entry.get('type', 'unknown').lower(),
+            'post_text': entry.get('content'),
+            'legacy': True
+        }
+        if entry.get('status') == 'rejected':
+            store.append('rejections', {**common, 'score': entry.get('score'), 'feedback': entry.get('reason')})
+            counts['rejections'] += 1
+        elif entry.get('status') == 'posting_error':
+            store.append('failures', {**common, 'error': str(entry.get('error'))})
+            counts['failures'] += 1
+
+    state, _ = load_state()
+    for key, value in state['activity'].items():
+        if key == 'reply_tracking':
+            for track_key, count in value.items():
+                conversation_id, _, author_id = track_key.rpartition('_')
+                for _ in range(count):
+                    store.incr_reply(conversation_id, author_id)
+        elif key in ('rejections', 'failures', 'repairs'):
+            for entry in value:
+                store.append(key, entry)
+                counts[key] = counts.get(key, 0) + 1
+        else:
+            store.set(key, value)
+    for entry in state['history']:
+        store.add_history(entry)
+        counts['posts'] += 1
+
+    for entry in (_read_json(TOPIC_HISTORY) or {}).get('topics', []):
+        if 'topic' in entry:
+            store.add_topic(entry['topic'], entry.get('timestamp'))
+            counts['topics'] += 1
+
+    store.set('imported_at', datetime.now().isoformat())
+    return counts
+
+
+if __name__ == "__main__":
+    print(f"Importing JSON state into {STATE_DB_FILE}...\n")
+    store = SQLiteStore()
+    for kind, count in import_json(store).items():
+        print(f"{kind}: {count}")
+    store.close()
+    print("\n✅ Import complete")
@@ -0,0 +1,269 @@
+"""
+Bot state (activity counters, bounded logs, posted history, reply tracking)
+kept as an append-only JSONL event log plus a periodically compacted snapshot
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+import metrics
+import transport
+from persistence import DirtyFlag, atomic_write_json, fsync_append
+
+# 'jsonl' (event log + snapshot) or 'sqlite' (see sqlite_store.py)
+STATE_BACKEND = os.getenv('STATE_BACKEND', 'jsonl').lower()
+STATE_LOG_FILE = transport.state_path(os.getenv('STATE_LOG_FILE', 'bot_events.jsonl'))
+STATE_SNAPSHOT_FILE = transport.state_path(os.getenv('STATE_SNAPSHOT_FILE', 'bot_state.json'))
+# Events appended to the log before it is folded into a new snapshot
+STATE_COMPACT_EVERY = int(os.getenv('STATE_COMPACT_EVERY', 200))
+
+# Files written by the bot before the event log existed; imported once
+ACTIVITY_LOG = 'bot_activity.json'
+POSTED_HISTORY = 'posted_history.json'
+
+# Bounded lists (rejections, failures, repairs) keep this many entries
+DEFAULT_LIST_LIMIT = 50
+
+DEFAULT_ACTIVITY = {
+    'total_posts': 0,
+    'successful_posts': 0,
+    'failed_posts': 0,
+    'total_rejections': 0,
+    'last_post_time': None,
+    'next_post_time': None,
+    'last_mention_id': None,
+    'learning_context': "",
+    'reply_tracking': {}
+}
+
+
+def open_store():
+    """
+    Open the configured state backend
+
+    Returns:
+        StateStore or SQLiteStore: Store for STATE_BACKEND
+    """
+    if STATE_BACKEND == 'sqlite':
+        # Imported here because sqlite_store builds on this module
+        from sqlite_store import SQLiteStore
+        return SQLiteStore()
+    return StateStore()
+
+
+def _reply_key(conversation_id, author_id):
+    """reply_tracking key for one author in one conversation"""
+    return f"{conversation_id}_{author_id}"
+
+
+def _empty_state():
+    return {'seq': 0, 'activity': json.loads(json.dumps(DEFAULT_ACTIVITY)), 'history': []}
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def apply_event(state, event):
+    """
+    Apply one event to an in-memory state
+
+    Args:
+        state (dict): {'seq', 'activity', 'history'}
+        event (dict): Event as written to the log
+    """
+    activity = state['activity']
+    op, key, value = event['op'], event.get('key'), event.get('value')
+    if op == 'set':
+        activity[key] = value
+    elif op == 'incr':
+        activity[key] = (activity.get(key) or 0) + value
+    elif op == 'append':
+        entries = activity.setdefault(key, [])
+        entries.append(value)
+        del entries[:-event.get('limit', DEFAULT_LIST_LIMIT)]
+    elif op == 'history':
+        state['history'].append(value)
+    elif op == 'reply':
+        tracking = activity.setdefault('reply_tracking', {})
+        tracking[key] = tracking.get(key, 0) + 1
+    state['seq'] = event['seq']
+
+
+def load_state(snapshot_file=STATE_SNAPSHOT_FILE, log_file=STATE_LOG_FILE):
+    """
+    Restore state from the last snapshot plus the events logged after it
+
+    Without a snapshot, the pre-event-log bot_activity.json and
+    posted_history.json are used as the starting point.
+
+    Returns:
+        tuple: (state dict, number of events replayed)
+    """
+    state = _read_json(snapshot_file)
+    if state is None:
+        state = _empty_state()
+        legacy_activity = _read_json(ACTIVITY_LOG)
+        if legacy_activity:
+            state['activity'].update(legacy_activity)
+        state['history'] = _read_json(POSTED_HISTORY) or []
+
+    replayed = 0
+    try:
+        with open(log_file, 'r') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves a partial last line
+                    metrics.increment('state.torn_events')
+                    continue
+                # Events already folded into the snapshot are skipped, so a crash
+                # between writing the snapshot and truncating the log is harmless
+                if event['seq'] <= state['seq']:
+                    continue
+                apply_event(state, event)
+                replayed += 1
+    except FileNotFoundError:
+        pass
+    return state, replayed
+
+
+class StateStore:
+    """
+    Event-sourced bot state
+
+    Every change is one line appended to the event log; the full state is only
+    rewritten when the log is compacted into the snapshot.
+    """
+
+    def __init__(self, log_file=STATE_LOG_FILE, snapshot_file=STATE_SNAPSHOT_FILE,
+                 compact_every=STATE_COMPACT_EVERY):
+        """
+        Initialize StateStore
+
+        Args:
+            log_file (str): Path to the JSONL event log
+            snapshot_file (str): Path to the compacted snapshot
+            compact_every (int): Events between compactions
+        """
+        self.log_file = log_file
+        self.snapshot_file = snapshot_file
+        self.compact_every = compact_every
+        # Reply and background lanes read and write concurrently
+        self._lock = threading.RLock()
+        self.state, self._pending = load_state(snapshot_file, log_file)
+        print(f"🗃️  State restored (seq {self.state['seq']}, {self._pending} events replayed)")
+        self._trim_torn_tail()
+        self._log = open(log_file, 'a')
+        # With PERSIST_FSYNC=batch, events appended since the last flush are fsynced together
+        self._log_sync = DirtyFlag(self._fsync_log, 'state_log')
+        if self._pending >= compact_every or not os.path.exists(snapshot_file):
+            self.compact()
+
+    def _trim_torn_tail(self):
+        """Cut a partial last line so the next event starts on its own line"""
+        try:
+            with open(self.log_file, 'rb+') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+        except FileNotFoundError:
+            pass
+
+    def _record(self, op, key=None, value=None, **extra):
+        """Apply an event and append it to the log"""
+        with self._lock:
+            event = {'seq': self.state['seq'] + 1, 'op': op, 'key': key, 'value': value, **extra}
+            apply_event(self.state, event)
+            self._log.write(json.dumps(event, ensure_ascii=False) + '\n')
+            if fsync_append(self._log):
+                self._log_sync.mark_dirty()
+            metrics.increment('state.events')
+            self._pending += 1
+            if self._pending >= self.compact_every:
+                self.compact()
+
+    def _fsync_log(self):
+        """Make the appended events durable (run by persistence.flush_all)"""
+        with self._lock:
+            if not self._log.closed:
+                os.fsync(self._log.fileno())
+
+    def get(self, key, default=None):
+        """Return an activity value"""
+        with self._lock:
+            return self.state['activity'].get(key, default)
+
+    def set(self, key, value):
+        """Set an activity value"""
+        self._record('set', key, value)
+
+    def incr(self, key, amount=1):
+        """Add to an activity counter"""
+        self._record('incr', key, amount)
+
+    def append(self, key, entry, limit=DEFAULT_LIST_LIMIT):
+        """
+        Append to a bounded activity list (e.g. 'rejections')
+
+        Args:
+            key (str): List name
+            entry (dict): Entry to append
+            limit (int): Only the last `limit` entries are kept
+        """
+        self._record('append', key, entry, limit=limit)
+
+    def recent(self, key, n=None):
+        """Return the last n entries of an activity list (all if n is None)"""
+        with self._lock:
+            entries = self.state['activity'].get(key) or []
+            return list(entries[-n:] if n else entries)
+
+    def add_history(self, entry):
+        """Record a posted tweet"""
+        self._record('history', value=entry)
+
+    def history(self, n=None):
+        """Return the last n posted tweets (all if n is None)"""
+        with self._lock:
+            entries = self.state['history']
+            return list(entries[-n:] if n else entries)
+
+    def reply_count(self, conversation_id, author_id):
+        """Replies sent in one conversation to one author"""
+        with self._lock:
+            tracking = self.state['activity'].get('reply_tracking', {})
+            return tracking.get(_reply_key(conversation_id, author_id), 0)
+
+    def incr_reply(self, conversation_id, author_id):
+        """Count a reply sent in one conversation to one author"""
+        self._record('reply', _reply_key(conversation_id, author_id))
+
+    def compact(self):
+        """
+        Write the current state as the new snapshot and truncate the event log
+
+        The snapshot is written atomically, so a crash leaves either the old
+        or the new snapshot, never a partial one.
+        """
+        with self._lock:
+            self.state['compacted_at'] = datetime.now().isoformat()
+            atomic_write_json(self.snapshot_file, self.state, indent=2, ensure_ascii=False)
+
+            self._log.close()
+            self._log = open(self.log_file, 'w')
+            self._pending = 0
+            metrics.increment('state.compactions')
+
+    def close(self):
+        """Compact and close the event log"""
+        with self._lock:
+            self.compact()
+            self._log.close()
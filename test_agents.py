@@ -0,0 +1,40 @@
+from agents import ReviewerAgent
+
+
+def make_reviewer():
+    # Parsing needs no API client
+    return ReviewerAgent.__new__(ReviewerAgent)
+
+
+def test_score_out_of_ten_parses_leading_number():
+    score, _ = make_reviewer()._parse_evaluation("SCORE: 7/10\nOVERALL_FEEDBACK: Flat ending")
+    assert score == 7
+
+
+def test_bold_score_label():
+    reviewer = make_reviewer()
+    response = "**SCORE:** 7\n**OVERALL_FEEDBACK:** Needs a hook"
+    assert reviewer._has_score(response)
+    assert reviewer._parse_evaluation(response) == (7, "OVERALL_FEEDBACK: Needs a hook")
+
+
+def test_batch_scores_out_of_ten():
+    response = "POST 1:\nSCORE: 7/10\n\nPOST 2:\n**SCORE:** 9\nOVERALL_FEEDBACK: Strong"
+    results = make_reviewer()._parse_batch_evaluation(response, 2)
+    assert [score for score, _ in results] == [7, 9]
+
+
+def test_shared_lead_in_is_not_a_duplicate_opening():
+    reviewer = make_reviewer()
+    recent = ["Hot take: the best code review is deleting the PR. Fight me."]
+    failures = reviewer.prescreen("Hot take: the best engineers write the least code. Am I wrong?",
+                                  recent_posts=recent)
+    assert not any('duplicate opening' in reason for reason in failures)
+
+
+def test_same_opening_after_lead_in_is_a_duplicate():
+    reviewer = make_reviewer()
+    recent = ["Hot take: TypeScript is a crutch for bad mental models. Fight me."]
+    failures = reviewer.prescreen("Unpopular opinion: TypeScript is a crutch and nobody admits it. Agree?",
+                                  recent_posts=recent)
+    assert any('duplicate opening' in reason for reason in failures)
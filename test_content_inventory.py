@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from content_inventory import ContentInventory, topic_ttl, INVENTORY_TTL_NEWS_HOURS
+
+
+def make_inventory(tmp_path, target_depth=2):
+    return ContentInventory(str(tmp_path / 'inventory.json'), target_depth=target_depth)
+
+
+def test_news_topics_expire_sooner():
+    assert topic_ttl(['Hacker News: Something shipped']) == timedelta(hours=INVENTORY_TTL_NEWS_HOURS)
+    assert topic_ttl(['TypeScript']) > topic_ttl(['GitHub Trend: repo'])
+
+
+def test_take_returns_the_entry_expiring_soonest(tmp_path):
+    inventory = make_inventory(tmp_path)
+    inventory.add("evergreen take", 9, "", 'controversial', ['TypeScript'])
+    inventory.add("news take", 8, "", 'controversial', ['Hacker News: Big launch'])
+
+    assert inventory.take('controversial')['post_text'] == "news take"
+    assert inventory.take('relatable') is None
+    assert inventory.depth() == 1
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    inventory = make_inventory(tmp_path)
+    inventory.add("stale take", 9, "", 'controversial', ['TypeScript'])
+    inventory.entries[0]['expires_at'] = (datetime.now() - timedelta(minutes=1)).isoformat()
+
+    assert inventory.take('controversial') is None
+    assert inventory.depth() == 0
+
+
+def test_most_needed_fills_the_emptiest_type(tmp_path):
+    inventory = make_inventory(tmp_path, target_depth=1)
+    inventory.add("take", 9, "", 'controversial', ['Rust'])
+
+    assert inventory.most_needed(['controversial', 'relatable']) == 'relatable'
+    inventory.add("relatable", 9, "", 'relatable', ['Standups'])
+    assert inventory.most_needed(['controversial', 'relatable']) is None
+
+
+def test_entries_survive_a_restart(tmp_path):
+    make_inventory(tmp_path).add("saved take", 9, "", 'controversial', ['Rust'])
+
+    assert make_inventory(tmp_path).take('controversial')['post_text'] == "saved take"
@@ -0,0 +1,56 @@
+from dedupe_index import DedupeIndex, signature, similarity
+
+POST = "Hot take: most microservice migrations are resume-driven development. Fight me."
+
+
+def make_index(tmp_path, **kwargs):
+    return DedupeIndex(str(tmp_path / 'dedupe.json'), **kwargs)
+
+
+def test_identical_texts_have_full_similarity():
+    assert similarity(signature(POST), signature(POST)) == 1.0
+
+
+def test_near_duplicate_is_found(tmp_path):
+    index = make_index(tmp_path)
+    index.add(POST, 'posted')
+
+    entry, score = index.find_duplicate(POST.replace("Fight me.", "Fight me!!"))
+    assert entry['text'] == POST
+    assert score >= index.threshold
+
+
+def test_different_post_is_new(tmp_path):
+    index = make_index(tmp_path)
+    index.add(POST, 'posted')
+
+    assert index.find_duplicate("Writing tests after the bug ships is still writing tests. Who else?") is None
+
+
+def test_sources_filter_matches(tmp_path):
+    index = make_index(tmp_path)
+    index.add(POST, 'rejected')
+
+    assert index.find_duplicate(POST, sources=('posted',)) is None
+    index.add(POST, 'posted')
+    assert index.find_duplicate(POST, sources=('posted',))[0]['source'] == 'posted'
+
+
+def test_oldest_entries_are_evicted(tmp_path):
+    index = make_index(tmp_path, max_entries=2)
+    index.add("first post about tabs versus spaces", 'posted')
+    index.add("second post about vim versus emacs", 'posted')
+    index.add("third post about monorepos versus polyrepos", 'posted')
+
+    assert len(index) == 2
+    assert index.find_duplicate("first post about tabs versus spaces") is None
+
+
+def test_index_survives_a_reload(tmp_path):
+    index = make_index(tmp_path)
+    index.add(POST, 'posted')
+    index.save()
+
+    reloaded = make_index(tmp_path)
+    assert len(reloaded) == 1
+    assert reloaded.find_duplicate(POST)[1] == 1.0
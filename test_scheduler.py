@@ -0,0 +1,128 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import scheduler
+from scheduler import Job, Scheduler
+
+
+class MemoryStore:
+    """Just the get/set the scheduler uses"""
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+def run_until(sched, done, timeout=5):
+    thread = threading.Thread(target=sched.run_forever, daemon=True)
+    thread.start()
+    assert done.wait(timeout)
+    sched.stop()
+    thread.join(timeout)
+
+
+def test_jobs_run_in_due_order():
+    sched = Scheduler()
+    order, done = [], threading.Event()
+
+    def job(name, last=False):
+        def run():
+            order.append(name)
+            if last:
+                done.set()
+            # Far in the future, so each job runs once
+            return datetime.now() + timedelta(hours=1)
+        return run
+
+    now = datetime.now()
+    sched.add(Job('third', job('third', last=True)), first_run=now + timedelta(seconds=0.3))
+    sched.add(Job('first', job('first')), first_run=now - timedelta(seconds=1))
+    sched.add(Job('second', job('second')), first_run=now + timedelta(seconds=0.1))
+    run_until(sched, done)
+
+    assert order == ['first', 'second', 'third']
+
+
+def test_reschedule_supersedes_the_old_time():
+    sched = Scheduler()
+    ran, done = [], threading.Event()
+
+    def late():
+        ran.append('late')
+        done.set()
+        return datetime.now() + timedelta(hours=1)
+
+    sched.add(Job('late', late), first_run=datetime.now() + timedelta(hours=1))
+    sched.reschedule('late', datetime.now())
+    run_until(sched, done)
+
+    assert ran == ['late']
+
+
+def test_saved_schedule_is_restored_after_restart():
+    saved = datetime.now() + timedelta(minutes=30)
+    store = MemoryStore({'schedule': {'post': saved.isoformat()}})
+    sched = Scheduler(store)
+    sched.add(Job('post', lambda: None), first_run=datetime.now())
+    sched.add(Job('metrics', lambda: None, interval_s=60))
+
+    assert sched.next_run('post') == saved
+    assert sched.next_run('metrics') <= datetime.now()
+
+
+def test_schedule_is_saved_after_each_run():
+    store = MemoryStore()
+    sched = Scheduler(store)
+    done = threading.Event()
+    sched.add(Job('mentions', done.set, interval_s=3600))
+    run_until(sched, done)
+    # The save follows the job; give the loop a moment to finish it
+    deadline = time.time() + 2
+    while 'mentions' not in (store.get('schedule') or {}) and time.time() < deadline:
+        time.sleep(0.01)
+
+    restored = Scheduler(store)
+    restored.add(Job('mentions', lambda: None, interval_s=3600))
+    assert restored.next_run('mentions') > datetime.now() + timedelta(minutes=59)
+
+
+def test_failing_job_is_retried(monkeypatch):
+    monkeypatch.setattr(scheduler, 'JOB_RETRY_S', 0.05)
+    sched = Scheduler()
+    calls, done = [], threading.Event()
+
+    def flaky():
+        calls.append(time.time())
+        if len(calls) == 1:
+            raise RuntimeError("API down")
+        done.set()
+        return datetime.now() + timedelta(hours=1)
+
+    sched.add(Job('flaky', flaky))
+    run_until(sched, done)
+
+    assert len(calls) == 2
+
+
+def test_failing_lane_job_is_retried(monkeypatch):
+    monkeypatch.setattr(scheduler, 'JOB_RETRY_S', 0.05)
+    sched = Scheduler(lanes={'background': 1})
+    calls, done = [], threading.Event()
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("API down")
+        done.set()
+        return datetime.now() + timedelta(hours=1)
+
+    sched.add(Job('post', flaky, lane='background'))
+    run_until(sched, done)
+
+    assert len(calls) == 2
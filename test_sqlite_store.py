@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from sqlite_store import SQLiteStore, import_json
+from state_store import StateStore
+
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # import_json reads the JSON state files from the working directory
+    monkeypatch.chdir(tmp_path)
+    store = SQLiteStore(str(tmp_path / 'state.db'))
+    yield store
+    store.close()
+
+
+def test_import_brings_in_legacy_and_current_state(store):
+    write_json('posted_history_legacy.json', [
+        {'timestamp': '2025-12-01T10:00:00', 'type': 'JOKE', 'content': 'old joke'},
+    ])
+    write_json('bot_activity_legacy.json', [
+        {'timestamp': '2025-12-02T10:00:00', 'type': 'Deal', 'content': 'meh', 'status': 'rejected',
+         'score': 4, 'reason': 'flat'},
+        {'timestamp': '2025-12-03T10:00:00', 'type': 'joke', 'content': 'boom', 'status': 'posting_error',
+         'error': '403'},
+        {'timestamp': '2025-12-04T10:00:00', 'type': 'joke', 'content': 'ok', 'status': 'posted'},
+    ])
+    current = StateStore()
+    current.incr('total_posts', 3)
+    current.set('last_mention_id', '99')
+    current.append('rejections', {'post_text': 'weak', 'score': 5})
+    current.add_history({'timestamp': '2026-02-01T09:00:00', 'content_type': 'controversial',
+                         'post_text': 'Tabs win. Fight me.', 'url': 'https://x.com/i/status/123'})
+    current.incr_reply('conv1', 'author1')
+    current.incr_reply('conv1', 'author1')
+    current.close()
+    write_json('topic_history.json', {'topics': [{'topic': 'Rust', 'timestamp': '2026-02-01T09:00:00'},
+                                                 {'timestamp': 'no topic'}]})
+
+    counts = import_json(store)
+
+    assert counts == {'posts': 2, 'rejections': 2, 'failures': 1, 'topics': 1}
+    assert [entry['post_text'] for entry in store.history()] == ['old joke', 'Tabs win. Fight me.']
+    assert store.history()[0]['content_type'] == 'joke'
+    assert [entry['score'] for entry in store.recent('rejections')] == [4, 5]
+    assert store.recent('failures')[0]['error'] == '403'
+    assert store.get('total_posts') == 3
+    assert store.get('last_mention_id') == '99'
+    assert store.reply_count('conv1', 'author1') == 2
+    assert store.recent_topics() == [{'topic': 'Rust', 'timestamp': '2026-02-01T09:00:00'}]
+    assert store.content_type_counts() == {'joke': 1, 'controversial': 1}
+
+
+def test_import_runs_only_once(store):
+    write_json('posted_history_legacy.json', [{'content': 'old joke', 'type': 'joke'}])
+
+    assert import_json(store)['posts'] == 1
+    assert import_json(store) == {}
+    assert len(store.history()) == 1
+
+
+def test_import_without_any_json_files(store):
+    assert import_json(store) == {'posts': 0, 'rejections': 0, 'failures': 0, 'topics': 0}
+    assert store.get('imported_at')
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from state_store import StateStore, load_state
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    # Keep the legacy bot_activity.json / posted_history.json lookups inside tmp_path
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / 'events.jsonl'), str(tmp_path / 'state.json')
+
+
+def make_store(paths, compact_every=100):
+    log_file, snapshot_file = paths
+    return StateStore(log_file=log_file, snapshot_file=snapshot_file, compact_every=compact_every)
+
+
+def test_events_are_replayed_on_top_of_the_snapshot(paths):
+    store = make_store(paths)
+    store.incr('total_posts')
+    store.set('last_mention_id', '42')
+    store.append('rejections', {'score': 3}, limit=2)
+    store.append('rejections', {'score': 4}, limit=2)
+    store.append('rejections', {'score': 5}, limit=2)
+    store.add_history({'post_text': 'hello'})
+    store.incr_reply('c1', 'a1')
+
+    state, replayed = load_state(paths[1], paths[0])
+    assert replayed == 7
+    assert state['activity']['total_posts'] == 1
+    assert state['activity']['last_mention_id'] == '42'
+    assert state['activity']['rejections'] == [{'score': 4}, {'score': 5}]
+    assert state['activity']['reply_tracking'] == {'c1_a1': 1}
+    assert state['history'] == [{'post_text': 'hello'}]
+
+
+def test_compaction_folds_the_log_into_the_snapshot(paths):
+    log_file, snapshot_file = paths
+    store = make_store(paths, compact_every=3)
+    for _ in range(4):
+        store.incr('total_posts')
+
+    with open(snapshot_file) as f:
+        assert json.load(f)['activity']['total_posts'] == 3
+    with open(log_file) as f:
+        assert len(f.readlines()) == 1
+
+    state, replayed = load_state(snapshot_file, log_file)
+    assert (state['activity']['total_posts'], replayed) == (4, 1)
+
+
+def test_events_already_in_the_snapshot_are_skipped(paths):
+    log_file, snapshot_file = paths
+    store = make_store(paths)
+    store.incr('total_posts')
+    store.incr('total_posts')
+    # A crash after writing the snapshot but before truncating the log
+    with open(log_file) as f:
+        events = f.read()
+    store.compact()
+    with open(log_file, 'w') as f:
+        f.write(events)
+
+    state, replayed = load_state(snapshot_file, log_file)
+    assert (state['activity']['total_posts'], replayed) == (2, 0)
+
+
+def test_torn_last_line_is_ignored_and_trimmed(paths):
+    log_file, _ = paths
+    store = make_store(paths)
+    store.incr('total_posts')
+    store.close()
+    store = make_store(paths)
+    store.incr('total_posts')
+    store._log.close()
+    with open(log_file, 'a') as f:
+        f.write('{"seq": 99, "op": "incr", "key": "total_')
+
+    restored = make_store(paths)
+    assert restored.get('total_posts') == 2
+    restored.incr('total_posts')
+    restored._log.flush()
+    with open(log_file) as f:
+        lines = f.readlines()
+    assert all(json.loads(line) for line in lines)
+    assert make_store(paths).get('total_posts') == 3
+
+
+def test_legacy_json_seeds_a_store_without_snapshot(paths):
+    with open('bot_activity.json', 'w') as f:
+        json.dump({'total_posts': 5, 'last_mention_id': '7'}, f)
+    with open('posted_history.json', 'w') as f:
+        json.dump([{'post_text': 'old'}], f)
+
+    store = make_store(paths)
+    assert store.get('total_posts') == 5
+    assert store.history() == [{'post_text': 'old'}]
@@ -0,0 +1,21 @@
+from text_analysis import analyze, has_engagement_hook
+
+
+def test_preamble_does_not_hide_hook():
+    analysis = analyze("Here's a controversial opinion: tabs beat spaces")
+    assert analysis.preamble == (0, len("Here's a controversial opinion: "))
+    assert 'opinion' in analysis.hooks
+
+
+def test_opinion_phrasing_is_not_a_preamble():
+    analysis = analyze("Honestly, I think microservices were the wrong call")
+    assert analysis.preamble is None
+    assert analysis.opener is None
+    assert has_engagement_hook("Honestly, I think microservices were the wrong call")
+
+
+def test_opener_keeps_following_hooks():
+    analysis = analyze("Here's my take: why do we still write YAML?")
+    assert analysis.opener == "here's my"
+    assert analysis.preamble is None
+    assert analysis.hooks == ('why', '?')
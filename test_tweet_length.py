@@ -0,0 +1,43 @@
+from tweet_length import MAX_TWEET_LENGTH, URL_LENGTH, truncate, weighted_length
+
+
+def test_cjk_counts_double():
+    assert weighted_length("日本語") == 6
+    assert weighted_length("abc 日本") == 8
+
+
+def test_emoji_sequences_count_once():
+    assert weighted_length("👨‍👩‍👧") == 2
+    assert weighted_length("1️⃣") == 2
+    assert weighted_length("👍🏽") == 2
+    assert weighted_length("🇺🇸") == 2
+
+
+def test_urls_count_fixed_length():
+    assert weighted_length("https://example.com/" + "a" * 100) == URL_LENGTH
+    assert weighted_length("see example.com/path") == 4 + URL_LENGTH
+    assert weighted_length("github.io/x") == URL_LENGTH
+
+
+def test_non_urls_are_counted_as_text():
+    assert weighted_length("github.io") == 9
+    assert weighted_length("file.py") == 7
+    assert weighted_length("a@b.com") == 7
+
+
+def test_truncate_leaves_text_at_the_limit_alone():
+    text = "a" * MAX_TWEET_LENGTH
+    assert truncate(text) == text
+
+
+def test_truncate_cuts_at_a_word_boundary_within_the_limit():
+    text = "word " * 70
+    cut = truncate(text)
+    assert weighted_length(cut) <= MAX_TWEET_LENGTH
+    assert cut.endswith("word...")
+
+
+def test_truncate_counts_weighted_characters():
+    cut = truncate("日" * 200)
+    assert weighted_length(cut) <= MAX_TWEET_LENGTH
+    assert cut.endswith("...")
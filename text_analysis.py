@@ -0,0 +1,171 @@
+"""
+Single-pass text analysis shared by the agents and the bot
+One compiled regex finds hooks, banned tokens and emoji in a single scan;
+AI preambles and openers are matched at the start of the text
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Phrases and characters that invite replies (matched anywhere, case-insensitive)
+HOOK_PHRASES = [
+    '?',  # Questions drive replies
+    'what do you think',
+    'change my mind',
+    'who else',
+    'relatable',
+    'just me',
+    'thoughts',
+    'fight me',
+    'anyone else',
+    'prove me wrong',
+    'am i wrong',
+    'i said what i said',
+    'cope',
+    'cry about it',
+    'debate me',
+    'agree',
+    'disagree',
+    'opinion',
+    'wrong',
+    'right',
+    'deny it',
+    'why',
+]
+HOOK_EMOJIS = {'👇', '👀', '🤔', '🤷‍♂️', '💀', '🔥', '😅'}
+
+# Tokens the prompts forbid
+BANNED_TOKENS = ['—']
+
+# Endings the prompts forbid (trailing emoji and punctuation are ignored)
+FORBIDDEN_ENDINGS = ['change my mind']
+
+# Label-style preambles the creator sometimes prepends; _clean_response strips them
+STRIPPED_PREAMBLES = [
+    "Here's a post:",
+    "Here is a post:",
+    "Post:",
+    "Tweet:",
+    "Here's a controversial opinion:",
+    "Here's a relatable post:",
+]
+
+# Chatty openers that mark a draft as unusable
+FLAGGED_OPENERS = [
+    "here's a", "here is a", "here's my", "sure,", "sure!", "certainly", "as an ai",
+    "draft:",
+]
+
+# Emoji ranges, then modifiers (variation selector, skin tones, subdivision
+# flag tags) and ZWJ sequences; a pair of regional indicators is one flag and
+# a keycap ('1️⃣') is one emoji. Symbols that default to text ('©', '↔', '⌚')
+# are emoji only with the emoji variation selector.
+_EMOJI = (r'(?:[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF]'
+          r'|[\u00A9\u00AE\u203C\u2049\u2122\u2139\u2194-\u21AA\u231A-\u23FF\u25AA-\u25FE'
+          r'\u3030\u303D\u3297\u3299]\uFE0F)')
+_EMOJI_CLUSTER = (
+    r'[\U0001F1E6-\U0001F1FF]{2}'
+    r'|[0-9#*]\uFE0F?\u20E3'
+    rf'|{_EMOJI}(?:[\uFE0F\U0001F3FB-\U0001F3FF\U000E0020-\U000E007F]|\u200D{_EMOJI})*'
+)
+# One emoji sequence per match (used by tweet_length)
+EMOJI_PATTERN = re.compile(_EMOJI_CLUSTER)
+
+
+def _alternation(items):
+    """Escape and join items, longest first so longer phrases win"""
+    return '|'.join(re.escape(item) for item in sorted(items, key=len, reverse=True))
+
+
+# Preambles and openers only ever sit at the start, so they are matched there
+# on their own; the scan below still sees their words (a preamble like
+# "Here's a controversial opinion:" also contains a hook)
+_PREAMBLE = re.compile(rf"\s*(?:(?:{_alternation(STRIPPED_PREAMBLES)})\s*)+", re.IGNORECASE)
+_OPENER = re.compile(rf"\s*(?:{_alternation(FLAGGED_OPENERS)})", re.IGNORECASE)
+_PATTERN = re.compile(
+    rf"(?P<banned>{_alternation(BANNED_TOKENS)})"
+    rf"|(?P<hook>{_alternation(HOOK_PHRASES)})"
+    rf"|(?P<emoji>{_EMOJI_CLUSTER})",
+    re.IGNORECASE
+)
+_TRAILING = re.compile(r'[\W_]*\Z')
+# Variation selector and skin tones do not change which emoji it is
+_EMOJI_MODIFIERS = re.compile(r'[\uFE0F\U0001F3FB-\U0001F3FF]')
+_HOOK_EMOJI_BASES = {_EMOJI_MODIFIERS.sub('', emoji): emoji for emoji in HOOK_EMOJIS}
+
+TextAnalysis = namedtuple(
+    'TextAnalysis',
+    ['hooks', 'banned', 'preamble', 'opener', 'emoji_count', 'forbidden_ending']
+)
+TextAnalysis.__doc__ = """
+Result of analyze()
+
+    hooks (tuple): Hook phrases and hook emoji found, lowercased, in order
+    banned (tuple): Banned tokens found
+    preamble (tuple): (start, end) span of leading STRIPPED_PREAMBLES, or None
+    opener (str): Leading FLAGGED_OPENERS match, lowercased, or None
+    emoji_count (int): Number of emoji (ZWJ sequences count once)
+    forbidden_ending (str): FORBIDDEN_ENDINGS phrase the text ends with, or None
+"""
+
+
+@lru_cache(maxsize=256)
+def analyze(text):
+    """
+    Scan text once for everything the pipeline checks
+
+    Results are cached, so the gate, the reviewer and the bot can each ask
+    about the same draft without rescanning it.
+
+    Args:
+        text (str): Post or draft text
+
+    Returns:
+        TextAnalysis: Immutable scan result
+    """
+    hooks, banned = [], []
+    preamble = opener = forbidden_ending = None
+    emoji_count = 0
+    text_end = _TRAILING.search(text).start()
+
+    match = _PREAMBLE.match(text)
+    if match:
+        preamble = match.span()
+    else:
+        match = _OPENER.match(text)
+        opener = match.group().strip().lower() if match else None
+
+    for match in _PATTERN.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'banned':
+            banned.append(value)
+        elif kind == 'hook':
+            hooks.append(value.lower())
+            if match.end() == text_end and value.lower() in FORBIDDEN_ENDINGS:
+                forbidden_ending = value.lower()
+        else:
+            emoji_count += 1
+            # A cluster counts if it contains a hook emoji, as with the old
+            # substring check ('👀️' and '👇🏻' are still hooks)
+            base = _EMOJI_MODIFIERS.sub('', value)
+            for hook_base, emoji in _HOOK_EMOJI_BASES.items():
+                if hook_base in base:
+                    hooks.append(emoji)
+                    break
+
+    return TextAnalysis(tuple(hooks), tuple(banned), preamble, opener, emoji_count, forbidden_ending)
+
+
+def has_engagement_hook(text):
+    """
+    Check if post has engagement-driving elements
+
+    Args:
+        text (str): Post text to check
+
+    Returns:
+        bool: True if has engagement hook
+    """
+    return bool(analyze(text).hooks)
@@ -0,0 +1,326 @@
+"""
+Record/replay HTTP transport for offline, deterministic runs
+Mounted under the xAI session, the tweepy client session and the news monitor
+"""
+
+import os
+import io
+import json
+import time
+import random
+import shutil
+import hashlib
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+import metrics
+from persistence import DirtyFlag, atomic_write
+
+# 'live' (no cassettes), 'record' (call the API and save every exchange)
+# or 'replay' (serve saved exchanges, no network or credentials needed)
+TRANSPORT_MODE = os.getenv('TRANSPORT_MODE', 'live').lower()
+CASSETTE_DIR = os.getenv('CASSETTE_DIR', 'cassettes')
+# Simulated latency in replay: milliseconds, or 'recorded' to replay the
+# latency measured while recording
+REPLAY_LATENCY_MS = os.getenv('REPLAY_LATENCY_MS', '0')
+# Seed for `random` in record and replay, so topic and style picks repeat
+REPLAY_SEED = int(os.getenv('REPLAY_SEED', 0))
+# Replay keeps its state files (event log, dedupe index, topics, inventory)
+# here, cleared at the start of every run, instead of the live ones
+REPLAY_STATE_DIR = os.path.join(CASSETTE_DIR, 'replay_state')
+
+# Request header naming the pipeline step ('generate', 'review', ...) so replay
+# can tell apart calls to the same endpoint; stripped before anything is sent
+CALL_SITE_HEADER = 'X-Cassette-Call-Site'
+
+# Response headers that no longer describe the saved (decoded) body, or that
+# should not end up on disk
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+def is_replay():
+    """Return True when running against cassettes instead of the network"""
+    return TRANSPORT_MODE == 'replay'
+
+
+def cassettes_enabled():
+    """Return True when recording or replaying"""
+    return TRANSPORT_MODE in ('record', 'replay')
+
+
+def call_headers(call_site):
+    """
+    Extra request headers identifying the call site to the cassette
+
+    Returns:
+        dict: The call site header, or None in live mode (nothing is added)
+    """
+    if not call_site or not cassettes_enabled():
+        return None
+    return {CALL_SITE_HEADER: call_site}
+
+
+def state_path(path):
+    """
+    Redirect a state file into REPLAY_STATE_DIR while replaying
+
+    A replay must not read or write the live state: drafts posted by an earlier
+    replay would show up as duplicates and shift which exchanges get served.
+
+    Args:
+        path (str): Live path of the state file
+
+    Returns:
+        str: Path to use for this run
+    """
+    if not is_replay():
+        return path
+    return os.path.join(REPLAY_STATE_DIR, os.path.basename(path))
+
+
+def start_run():
+    """
+    Prepare a record or replay run (no-op in live mode)
+
+    Seeds `random` so topic and style selection repeat, and in replay starts
+    from an empty state directory so every replay behaves the same.
+    """
+    if not cassettes_enabled():
+        return
+    random.seed(REPLAY_SEED)
+    if is_replay():
+        shutil.rmtree(REPLAY_STATE_DIR, ignore_errors=True)
+        os.makedirs(REPLAY_STATE_DIR, exist_ok=True)
+
+
+def credential(value, name):
+    """
+    Return an API credential, substituting a placeholder in replay mode
+
+    Args:
+        value (str): Credential from the environment (may be None)
+        name (str): Credential name, used in the placeholder
+
+    Returns:
+        str: The credential, or a dummy value when replaying without one
+    """
+    if value or not is_replay():
+        return value
+    return f"replay-{name.lower()}"
+
+
+def install(session, name):
+    """
+    Mount a cassette adapter on a requests session (no-op in live mode)
+
+    Args:
+        session (requests.Session): Session to wrap
+        name (str): Cassette name, e.g. 'xai' -> CASSETTE_DIR/xai.json
+
+    Returns:
+        requests.Session: The same session
+    """
+    if not cassettes_enabled():
+        return session
+
+    cassette = Cassette(os.path.join(CASSETTE_DIR, f"{name}.json"))
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, CassetteAdapter(cassette, session.get_adapter(prefix)))
+    print(f"📼 {name}: {TRANSPORT_MODE} mode ({cassette.path})")
+    return session
+
+
+class Cassette:
+    """
+    Ordered list of recorded request/response exchanges in one JSON file
+    """
+
+    def __init__(self, path):
+        """
+        Initialize Cassette
+
+        Args:
+            path (str): Path to the cassette JSON file
+        """
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+        # Replay indexes (exact request, endpoint + call) and times each exchange was served
+        self._by_key = defaultdict(list)
+        self._by_route = defaultdict(list)
+        self._served = defaultdict(int)
+        self._dirty = DirtyFlag(self.save, 'cassette')
+        self.load()
+
+    @staticmethod
+    def request_key(request):
+        """
+        Identify a request by method, URL and body (never by auth headers)
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        material = f"{request.method} {request.url}\n".encode('utf-8') + body
+        return hashlib.sha256(material).hexdigest()
+
+    @staticmethod
+    def route(request):
+        """
+        Method and URL without the query string, plus the kind of call, the fallback match
+
+        Generation, review, shortening and replies all POST to the same xAI
+        endpoint, so the call site header (or, without one, the model and a
+        hash of the system prompt) keeps a review from being served a draft.
+        """
+        parts = urlsplit(request.url)
+        route = f"{request.method} {parts.scheme}://{parts.netloc}{parts.path}"
+        call = request.headers.get(CALL_SITE_HEADER) or Cassette._body_signature(request.body)
+        return f"{route} [{call}]" if call else route
+
+    @staticmethod
+    def _body_signature(body):
+        """Model and system prompt hash of a chat completions body, or None"""
+        try:
+            data = json.loads(body or b'')
+            system = next((m['content'] for m in data['messages'] if m.get('role') == 'system'), '')
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+        return f"{data.get('model')}:{hashlib.sha256(system.encode('utf-8')).hexdigest()[:12]}"
+
+    def load(self):
+        """Load interactions from file and index them for replay"""
+        try:
+            with open(self.path, 'r') as f:
+                self.interactions = json.load(f).get('interactions', [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.interactions = []
+
+        for index, interaction in enumerate(self.interactions):
+            self._by_key[interaction['key']].append(index)
+            self._by_route[interaction['route']].append(index)
+
+    def save(self):
+        """Save cassette to file"""
+        with self._lock:
+            content = json.dumps({'interactions': self.interactions}, indent=2, ensure_ascii=False)
+        atomic_write(self.path, content)
+
+    def record(self, request, status, reason, headers, body, elapsed):
+        """Append one exchange (saved with the next flush)"""
+        interaction = {
+            'key': self.request_key(request),
+            'route': self.route(request),
+            'url': request.url,
+            'status': status,
+            'reason': reason,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+            'body': body.decode('utf-8', errors='replace'),
+            'elapsed': round(elapsed, 3)
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        self._dirty.mark_dirty()
+
+    def match(self, request):
+        """
+        Find the recorded exchange for a request
+
+        Exact matches (same method, URL and body) win. Prompts and query strings
+        can vary between runs (news, dates), so otherwise an exchange recorded
+        for the same endpoint and call site is used. Within either, the least served
+        exchange goes first (recorded order breaks ties), so a cassette replays
+        in order and then wraps around for any number of runs.
+
+        Returns:
+            dict: Interaction, or None if the endpoint was never recorded
+        """
+        with self._lock:
+            for index_name, candidates in (('key', self._by_key.get(self.request_key(request))),
+                                           ('route', self._by_route.get(self.route(request)))):
+                if not candidates:
+                    continue
+                index = min(candidates, key=lambda i: (self._served[i], i))
+                self._served[index] += 1
+                metrics.increment(f'transport.replay.{index_name}_matches')
+                return self.interactions[index]
+        return None
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    Transport adapter that records through, or replays from, a Cassette
+    """
+
+    def __init__(self, cassette, inner=None):
+        """
+        Args:
+            cassette (Cassette): Where exchanges are stored
+            inner (HTTPAdapter): Adapter used for real requests in record mode
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner or HTTPAdapter()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if is_replay():
+            interaction = self.cassette.match(request)
+            if interaction is None:
+                metrics.increment('transport.replay.misses')
+                raise requests.exceptions.ConnectionError(
+                    f"No recorded response for {Cassette.route(request)} in {self.cassette.path}",
+                    request=request
+                )
+            self._simulate_latency(interaction)
+            return self._build(request, interaction['status'], interaction['reason'],
+                               interaction['headers'], interaction['body'].encode('utf-8'))
+
+        if CALL_SITE_HEADER in request.headers:
+            # Recorded under the header (see route), but never sent to the API
+            sent = request.copy()
+            del sent.headers[CALL_SITE_HEADER]
+        else:
+            sent = request
+        start = time.time()
+        response = self.inner.send(sent, stream=stream, timeout=timeout, verify=verify,
+                                   cert=cert, proxies=proxies)
+        # Reading the whole body means streamed calls are not incremental while recording
+        body = response.content
+        elapsed = time.time() - start
+        self.cassette.record(request, response.status_code, response.reason,
+                             response.headers, body, elapsed)
+        metrics.increment('transport.recorded')
+        return self._build(request, response.status_code, response.reason,
+                           response.headers, body)
+
+    def _build(self, request, status, reason, headers, body):
+        """Build a requests.Response the same way a live adapter would"""
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers={k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+            status=status,
+            reason=reason,
+            preload_content=False,
+            decode_content=False
+        )
+        return self.build_response(request, raw)
+
+    def _simulate_latency(self, interaction):
+        """Sleep for REPLAY_LATENCY_MS (or the recorded latency)"""
+        if REPLAY_LATENCY_MS == 'recorded':
+            delay = interaction.get('elapsed', 0)
+        else:
+            delay = float(REPLAY_LATENCY_MS or 0) / 1000
+        if delay > 0:
+            time.sleep(delay)
+
+    def close(self):
+        self.inner.close()
+        super().close()
@@ -0,0 +1,134 @@
+"""
+X (Twitter) weighted character counting and truncation
+Follows the twitter-text v3 rules: most scripts count 2, Latin and common
+punctuation count 1, every URL counts 23 and every emoji sequence counts 2
+
+Known gap: bare domains (no scheme or www.) are only recognized for the TLDs
+listed below, where twitter-text uses the full IANA list
+"""
+
+import re
+import unicodedata
+
+from text_analysis import EMOJI_PATTERN
+
+MAX_TWEET_LENGTH = 280
+URL_LENGTH = 23
+EMOJI_LENGTH = 2
+DEFAULT_WEIGHT = 2
+# Code point ranges that count as 1 (Latin, general punctuation, quotes, primes)
+LIGHT_RANGES = [
+    (0x0000, 0x10FF),
+    (0x2000, 0x200D),
+    (0x2010, 0x201F),
+    (0x2032, 0x2037),
+]
+ELLIPSIS = "..."
+
+# Bare domains count as URLs: generic TLDs always, country-code TLDs only with
+# a path ('github.io/x'), as in twitter-text
+GENERIC_TLDS = ['com', 'org', 'net', 'edu', 'gov', 'dev', 'app', 'info', 'biz', 'blog',
+                'tech', 'xyz', 'news', 'site', 'online', 'cloud']
+COUNTRY_TLDS = ['io', 'ai', 'co', 'gg', 'ly', 'me', 'tv', 'sh', 'so', 'to', 'us', 'uk', 'de', 'fr',
+                'ca', 'in', 'jp', 'eu']
+
+_URL_TAIL = r'[^\s<>"]*[^\s<>".,:;!?)\]\']'
+_DOMAIN = r'(?<![\w@.-])(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+'
+# Trailing punctuation is not part of the URL
+URL_PATTERN = re.compile(
+    rf'(?:https?://|www\.){_URL_TAIL}'
+    rf'|{_DOMAIN}(?:{"|".join(GENERIC_TLDS)})(?![\w-])(?:/{_URL_TAIL}|/)?'
+    rf'|{_DOMAIN}(?:{"|".join(COUNTRY_TLDS)})(?:/{_URL_TAIL}|/)',
+    re.IGNORECASE
+)
+# URLs first, then emoji sequences; anything else is counted per grapheme cluster
+_TOKEN_PATTERN = re.compile(rf'(?P<url>{URL_PATTERN.pattern})|(?P<emoji>{EMOJI_PATTERN.pattern})',
+                            re.IGNORECASE)
+
+
+def _char_weight(char):
+    """Weight of a single code point"""
+    code = ord(char)
+    for low, high in LIGHT_RANGES:
+        if low <= code <= high:
+            return 1
+    return DEFAULT_WEIGHT
+
+
+def _segments(text):
+    """
+    Split text into countable pieces
+
+    Yields:
+        tuple: (piece, weight) for each URL, emoji sequence or grapheme cluster
+    """
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        yield from _graphemes(text[position:match.start()])
+        yield match.group(), URL_LENGTH if match.lastgroup == 'url' else EMOJI_LENGTH
+        position = match.end()
+    yield from _graphemes(text[position:])
+
+
+def _graphemes(text):
+    """Group each base character with the combining marks that follow it"""
+    cluster, weight = '', 0
+    for char in text:
+        if cluster and (unicodedata.combining(char) or unicodedata.category(char) == 'Me'
+                        or char in '\u200d\ufe0f'):
+            cluster += char
+            weight += _char_weight(char)
+            continue
+        if cluster:
+            yield cluster, weight
+        cluster, weight = char, _char_weight(char)
+    if cluster:
+        yield cluster, weight
+
+
+def weighted_length(text):
+    """
+    Length of text as X counts it
+
+    Args:
+        text (str): Tweet text
+
+    Returns:
+        int: Weighted length (a tweet may be at most MAX_TWEET_LENGTH)
+    """
+    text = unicodedata.normalize('NFC', text)
+    return sum(weight for _, weight in _segments(text))
+
+
+def truncate(text, limit=MAX_TWEET_LENGTH, ellipsis=ELLIPSIS):
+    """
+    Shorten text to fit in a tweet without splitting words, URLs or emoji
+
+    Cuts at the last word boundary that fits (or the last whole grapheme if
+    that would drop more than a third of the text) and appends the ellipsis.
+
+    Args:
+        text (str): Tweet text
+        limit (int): Maximum weighted length
+        ellipsis (str): Appended when text is cut
+
+    Returns:
+        str: text unchanged if it fits, otherwise the truncated text
+    """
+    text = unicodedata.normalize('NFC', text)
+    if weighted_length(text) <= limit:
+        return text
+
+    budget = limit - weighted_length(ellipsis)
+    kept, used, last_break = [], 0, 0
+    for piece, weight in _segments(text):
+        if used + weight > budget:
+            break
+        kept.append(piece)
+        used += weight
+        if piece.isspace():
+            last_break = len(kept)
+
+    if last_break and last_break >= len(kept) * 2 // 3:
+        kept = kept[:last_break]
+    return ''.join(kept).rstrip(' \t\n,;:-') + ellipsis
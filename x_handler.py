@@ -8,6 +8,9 @@ import tweepy
 import random
 from dotenv import load_dotenv
 
+import transport
+import tweet_length
+
 load_dotenv()
 
 
@@ -21,11 +24,11 @@ class XHandler:
     
     def __init__(self):
         """Initialize X API client with credentials from .env"""
-        self.bearer_token = os.getenv('X_BEARER_TOKEN')
-        self.api_key = os.getenv('X_API_KEY')
-        self.api_secret = os.getenv('X_API_SECRET')
-        self.access_token = os.getenv('X_ACCESS_TOKEN')
-        self.access_token_secret = os.getenv('X_ACCESS_TOKEN_SECRET')
+        self.bearer_token = transport.credential(os.getenv('X_BEARER_TOKEN'), 'X_BEARER_TOKEN')
+        self.api_key = transport.credential(os.getenv('X_API_KEY'), 'X_API_KEY')
+        self.api_secret = transport.credential(os.getenv('X_API_SECRET'), 'X_API_SECRET')
+        self.access_token = transport.credential(os.getenv('X_ACCESS_TOKEN'), 'X_ACCESS_TOKEN')
+        self.access_token_secret = transport.credential(os.getenv('X_ACCESS_TOKEN_SECRET'), 'X_ACCESS_TOKEN_SECRET')
         
         # Initialize Tweepy client for v2 API
         self.client = tweepy.Client(
@@ -35,6 +38,8 @@ class XHandler:
             access_token=self.access_token,
             access_token_secret=self.access_token_secret
         )
+        # Record/replay cassettes when TRANSPORT_MODE is set (see transport.py)
+        transport.install(self.client.session, 'x_api')
         
         print("✅ X Handler initialized successfully")
     
@@ -49,10 +54,11 @@ class XHandler:
             tuple: (url, error_message) - url is None if failed, error_message is None if success
         """
         try:
-            # Ensure text is under 280 characters
-            if len(text) > 280:
-                print(f"⚠️  Tweet too long ({len(text)} chars), truncating...")
-                text = text[:277] + "..."
+            # Ensure text fits X's weighted 280-character limit
+            length = tweet_length.weighted_length(text)
+            if length > tweet_length.MAX_TWEET_LENGTH:
+                print(f"⚠️  Tweet too long ({length} weighted chars), truncating...")
+                text = tweet_length.truncate(text)
             
             # Post tweet using v2 API
             response = self.client.create_tweet(text=text)
@@ -300,6 +306,7 @@ class XHandler:
             tuple: (url, error_message)
         """
         try:
+            text = tweet_length.truncate(text)
             response = self.client.create_tweet(
                 text=text,
                 in_reply_to_tweet_id=tweet_id
@@ -1,61 +1,482 @@
 import os
+import time
+import asyncio
+import threading
+import weakref
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+import metrics
+import transport
+from completion_cache import CompletionCache
+
 load_dotenv()
 
+# Connection pool configuration (shared by every agent in the process)
+XAI_POOL_SIZE = int(os.getenv('XAI_POOL_SIZE', 10))
+XAI_CONNECT_TIMEOUT = float(os.getenv('XAI_CONNECT_TIMEOUT', 5))
+XAI_READ_TIMEOUT = float(os.getenv('XAI_READ_TIMEOUT', 60))
+# Max completions in flight at once per event loop for the async API
+XAI_MAX_CONCURRENCY = int(os.getenv('XAI_MAX_CONCURRENCY', 4))
+# Disk cache in front of non-streaming completions (see completion_cache.py).
+# Off while recording or replaying: a cache hit would skip a cassette exchange
+COMPLETION_CACHE_ENABLED = (os.getenv('COMPLETION_CACHE_ENABLED', 'true').lower() == 'true'
+                            and not transport.cassettes_enabled())
+
+# Model tiers and which tier each call site uses
+MODEL_TIERS = {
+    'fast': os.getenv('XAI_MODEL_FAST', 'grok-4-1-fast-non-reasoning'),
+    'strong': os.getenv('XAI_MODEL_STRONG', 'grok-4-1-fast-reasoning'),
+}
+CALL_SITE_TIERS = {
+    'generate': os.getenv('XAI_ROUTE_GENERATE', 'strong'),
+    'revise': os.getenv('XAI_ROUTE_REVISE', 'strong'),
+    'reply': os.getenv('XAI_ROUTE_REPLY', 'fast'),
+    'review': os.getenv('XAI_ROUTE_REVIEW', 'fast'),
+    'review_repair': os.getenv('XAI_ROUTE_REVIEW', 'fast'),
+    'review_escalation': os.getenv('XAI_ROUTE_REVIEW_ESCALATION', 'strong'),
+    'shorten': os.getenv('XAI_ROUTE_SHORTEN', 'fast'),
+}
+DEFAULT_TIER = os.getenv('XAI_DEFAULT_TIER', 'strong')
+
+# Request hedging: if a non-streaming call is slower than the HEDGE_PERCENTILE
+# of recent latency on its tier, send a duplicate and take whichever finishes first
+XAI_HEDGING = os.getenv('XAI_HEDGING', 'false').lower() == 'true'
+HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', 95))
+# Max share of calls that may send a hedge request
+HEDGE_MAX_RATIO = float(os.getenv('HEDGE_MAX_RATIO', 0.1))
+# Latency samples needed on a tier before hedging kicks in
+HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', 20))
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_xai_client():
+    """
+    Return the process-wide XAIWrapper, creating it on first use.
+
+    All agents share this instance so they reuse one pooled keep-alive
+    session instead of paying a TCP+TLS handshake per call.
+
+    Returns:
+        XAIWrapper: Shared client
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = XAIWrapper()
+    return _shared_client
+
+
+def resolve_tier(call_site):
+    """
+    Map a call site ('generate', 'review', 'reply', ...) to its model tier
+
+    Returns:
+        str: Tier name, a key of MODEL_TIERS
+    """
+    tier = CALL_SITE_TIERS.get(call_site, DEFAULT_TIER)
+    return tier if tier in MODEL_TIERS else DEFAULT_TIER
+
+
 class XAIWrapper:
     """
     Wrapper for xAI (Grok) API interactions.
     Compatible with the updated agents.py interface.
     """
-    def __init__(self):
-        self.api_key = os.getenv("XAI_API_KEY")
+    def __init__(self, pool_size=None, connect_timeout=None, read_timeout=None, max_concurrency=None):
+        """
+        Args:
+            pool_size (int): Max pooled keep-alive connections to api.x.ai
+            connect_timeout (float): Seconds to wait for a connection
+            read_timeout (float): Seconds to wait for the response
+            max_concurrency (int): Max concurrent async completions per event loop
+        """
+        self.api_key = transport.credential(os.getenv("XAI_API_KEY"), "XAI_API_KEY")
         self.api_url = "https://api.x.ai/v1/chat/completions"
         if not self.api_key:
             raise ValueError("XAI_API_KEY not found in .env")
 
-    def generate_completion(self, prompt, system_prompt="You are a helpful AI assistant."):
+        self.models = dict(MODEL_TIERS)
+        self.temperature = 0.8
+        self.cache = CompletionCache() if COMPLETION_CACHE_ENABLED else None
+
+        self.pool_size = pool_size or XAI_POOL_SIZE
+        self.connect_timeout = connect_timeout or XAI_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or XAI_READ_TIMEOUT
+        self.max_concurrency = max_concurrency or XAI_MAX_CONCURRENCY
+        # asyncio.Semaphore is bound to one loop, so keep one per running loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        # Lane workers and detached loops look up their semaphores from different threads
+        self._semaphores_lock = threading.Lock()
+        # Threads for hedged requests (a primary and at most one hedge per call)
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=self.pool_size * 2, thread_name_prefix='xai-hedge'
+        ) if XAI_HEDGING else None
+
+        # One keep-alive session per process; connections are reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        # Record/replay cassettes when TRANSPORT_MODE is set (see transport.py)
+        transport.install(self.session, 'xai')
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def generate_completion(self, prompt, system_prompt="You are a helpful AI assistant.",
+                            connect_timeout=None, read_timeout=None, call_site=None, prompt_version=None,
+                            response_format=None, validate=None):
         """
         Generates a completion for the given prompt using xAI Grok model.
-        
+
         Args:
             prompt (str): The user's input prompt
             system_prompt (str): Optional system instruction
-            
+            connect_timeout (float): Per-call override of the connect timeout
+            read_timeout (float): Per-call override of the read timeout
+            call_site (str): Pipeline step making the call ('generate', 'review', 'reply', ...);
+                selects the model tier, the cache TTL and the per-tier metrics
+            prompt_version: Version of the caller's prompt template, part of the cache key
+            response_format (dict): Optional structured-output spec (e.g. a JSON schema)
+            validate (callable): Only responses for which validate(text) is true are
+                cached, so a malformed answer is not replayed on every retry
+
         Returns:
             str: The model's response text
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": "grok-4-1-fast-reasoning",  # Updated as per user request
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.8,
-            "stream": False
-        }
+        tier = resolve_tier(call_site)
+        cache_key = None
+        if self.cache and call_site:
+            cache_key = CompletionCache.make_key(
+                self.models[tier], system_prompt, prompt, self.temperature, prompt_version
+            )
+            cached = self.cache.get(cache_key, call_site)
+            if cached is not None:
+                return cached
+
+        choices = self._request_choices(prompt, system_prompt, 1, connect_timeout, read_timeout,
+                                        call_site, response_format)
+        text = choices[0] if choices else None
+        if cache_key and text is not None:
+            if validate is None or validate(text):
+                self.cache.put(cache_key, call_site, text)
+            else:
+                metrics.increment(f'cache.{call_site}.rejected')
+        return text
+
+    def generate_completions(self, prompt, system_prompt="You are a helpful AI assistant.", n=2,
+                             connect_timeout=None, read_timeout=None, call_site='generate'):
+        """
+        Generate several independent completions in a single request (API `n`).
+
+        Args:
+            prompt (str): The user's input prompt
+            system_prompt (str): Optional system instruction
+            n (int): Number of completions to sample
+            connect_timeout (float): Per-call override of the connect timeout
+            read_timeout (float): Per-call override of the read timeout
+            call_site (str): Pipeline step making the call; selects the model tier
+
+        Returns:
+            list: Response texts (may be shorter than n; empty on failure)
+        """
+        return self._request_choices(prompt, system_prompt, n, connect_timeout, read_timeout,
+                                     call_site) or []
+
+    def _request_choices(self, prompt, system_prompt, n, connect_timeout, read_timeout, call_site,
+                         response_format=None):
+        """Send one non-streaming request and return the text of every choice"""
+        tier = resolve_tier(call_site)
+        data = self._build_payload(prompt, system_prompt, tier, stream=False)
+        if n > 1:
+            data["n"] = n
+        if response_format:
+            data["response_format"] = response_format
+        timeout = (connect_timeout or self.connect_timeout, read_timeout or self.read_timeout)
 
         try:
-            response = requests.post(self.api_url, headers=headers, json=data, timeout=60)
-            
+            start = time.monotonic()
+            response = self._post(data, timeout, tier, transport.call_headers(call_site))
+            elapsed = time.monotonic() - start
+            metrics.increment('xai.calls')
+            metrics.observe('xai.total_s', elapsed)
+
             if response.status_code != 200:
                 print(f"⚠️ xAI API Error {response.status_code}: {response.text}")
                 return None
-                
+
             result = response.json()
+            self._record_tier_usage(tier, elapsed, result.get('usage'))
             if 'choices' in result and len(result['choices']) > 0:
-                return result['choices'][0]['message']['content'].strip()
+                return [
+                    choice['message']['content'].strip()
+                    for choice in result['choices']
+                    if choice.get('message', {}).get('content')
+                ]
             else:
                 print(f"⚠️ Unexpected API response format: {result}")
                 return None
-                
+
         except Exception as e:
             print(f"❌ xAI Request Exception: {e}")
             return None
+
+    def iter_completion(self, prompt, system_prompt="You are a helpful AI assistant.",
+                        connect_timeout=None, read_timeout=None, call_site='generate', usage=None):
+        """
+        Stream a completion, yielding content deltas as they arrive (SSE).
+
+        Closing the generator early closes the HTTP response, which aborts
+        the request server-side and stops further token billing.
+
+        Args:
+            prompt (str): The user's input prompt
+            system_prompt (str): Optional system instruction
+            connect_timeout (float): Per-call override of the connect timeout
+            read_timeout (float): Per-call override of the read timeout
+            call_site (str): Pipeline step making the call; selects the model tier
+            usage (dict): If given, filled with the token usage sent at the end of the stream
+
+        Yields:
+            str: Content text fragments
+        """
+        data = self._build_payload(prompt, system_prompt, resolve_tier(call_site), stream=True)
+        data["stream_options"] = {"include_usage": True}
+        timeout = (connect_timeout or self.connect_timeout, read_timeout or self.read_timeout)
+
+        with self.session.post(self.api_url, json=data, timeout=timeout, stream=True,
+                               headers=transport.call_headers(call_site)) as response:
+            if response.status_code != 200:
+                print(f"⚠️ xAI API Error {response.status_code}: {response.text}")
+                return
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                payload = line[len('data:'):].strip()
+                if payload == '[DONE]':
+                    break
+
+                chunk = json.loads(payload)
+                if usage is not None and chunk.get('usage'):
+                    usage.update(chunk['usage'])
+                choices = chunk.get('choices') or []
+                if choices:
+                    delta = (choices[0].get('delta') or {}).get('content')
+                    if delta:
+                        yield delta
+
+    def stream_completion(self, prompt, system_prompt="You are a helpful AI assistant.",
+                          should_abort=None, on_token=None, connect_timeout=None, read_timeout=None,
+                          call_site='generate'):
+        """
+        Generate a completion in streaming mode with optional early abort.
+
+        Args:
+            prompt (str): The user's input prompt
+            system_prompt (str): Optional system instruction
+            should_abort (callable): Called with the text so far after every
+                token; returning a non-empty reason string aborts the request
+            on_token (callable): Called with each content fragment
+            connect_timeout (float): Per-call override of the connect timeout
+            read_timeout (float): Per-call override of the read timeout
+            call_site (str): Pipeline step making the call; selects the model tier
+
+        Returns:
+            tuple: (text, stats) - text is None if the request failed;
+                stats has 'ttft' and 'total' seconds and 'aborted' (reason or None)
+        """
+        start = time.monotonic()
+        stats = {'ttft': None, 'total': None, 'aborted': None}
+        parts = []
+        usage = {}
+        stream = self.iter_completion(prompt, system_prompt, connect_timeout, read_timeout,
+                                      call_site=call_site, usage=usage)
+
+        try:
+            for delta in stream:
+                if stats['ttft'] is None:
+                    stats['ttft'] = time.monotonic() - start
+                parts.append(delta)
+                if on_token:
+                    on_token(delta)
+                if should_abort:
+                    reason = should_abort(''.join(parts))
+                    if reason:
+                        stats['aborted'] = reason
+                        break
+        except Exception as e:
+            print(f"❌ xAI Stream Exception: {e}")
+            parts = []
+        finally:
+            stream.close()
+
+        stats['total'] = time.monotonic() - start
+        metrics.increment('xai.calls')
+        metrics.observe('xai.stream.ttft_s', stats['ttft'])
+        metrics.observe('xai.stream.total_s', stats['total'])
+        self._record_tier_usage(resolve_tier(call_site), stats['total'], usage)
+        if stats['aborted']:
+            metrics.increment('xai.stream.aborted')
+
+        ttft = f"{stats['ttft']:.2f}s" if stats['ttft'] is not None else "n/a"
+        aborted = f", aborted: {stats['aborted']}" if stats['aborted'] else ""
+        print(f"⏱️ xAI stream: ttft {ttft}, total {stats['total']:.2f}s{aborted}")
+
+        text = ''.join(parts).strip()
+        return (text or None), stats
+
+    async def agenerate_completion(self, prompt, system_prompt="You are a helpful AI assistant.",
+                                   connect_timeout=None, read_timeout=None, call_site=None, prompt_version=None,
+                                   response_format=None, validate=None):
+        """
+        Async counterpart of generate_completion.
+
+        The blocking request runs on a worker thread over the shared pooled
+        session, so many completions can be awaited together on one event
+        loop. At most max_concurrency calls are in flight per loop.
+
+        Args:
+            prompt (str): The user's input prompt
+            system_prompt (str): Optional system instruction
+            connect_timeout (float): Per-call override of the connect timeout
+            read_timeout (float): Per-call override of the read timeout
+            call_site (str): Pipeline step making the call (tier, cache TTL, metrics)
+            prompt_version: Version of the caller's prompt template
+            response_format (dict): Optional structured-output spec
+            validate (callable): Only responses for which validate(text) is true are cached
+
+        Returns:
+            str: The model's response text
+        """
+        async with self._get_semaphore():
+            return await asyncio.to_thread(
+                self.generate_completion, prompt, system_prompt,
+                connect_timeout=connect_timeout, read_timeout=read_timeout,
+                call_site=call_site, prompt_version=prompt_version,
+                response_format=response_format, validate=validate
+            )
+
+    async def astream_completion(self, prompt, system_prompt="You are a helpful AI assistant.",
+                                 should_abort=None, on_token=None, connect_timeout=None, read_timeout=None,
+                                 call_site='generate'):
+        """
+        Async counterpart of stream_completion, bounded like agenerate_completion.
+
+        Returns:
+            tuple: (text, stats)
+        """
+        async with self._get_semaphore():
+            return await asyncio.to_thread(
+                self.stream_completion, prompt, system_prompt,
+                should_abort=should_abort, on_token=on_token,
+                connect_timeout=connect_timeout, read_timeout=read_timeout,
+                call_site=call_site
+            )
+
+    def _build_payload(self, prompt, system_prompt, tier, stream=False):
+        """Build the chat completions request body"""
+        return {
+            "model": self.models[tier],
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.temperature,
+            "stream": stream
+        }
+
+    def _post(self, data, timeout, tier, headers=None):
+        """
+        POST a completion request, hedging it when it runs slower than usual.
+
+        Python threads cannot interrupt a blocking HTTP call, so the losing
+        request is cancelled if it has not started and otherwise has its
+        response discarded and closed as soon as it returns.
+
+        Returns:
+            requests.Response: The first response to arrive
+        """
+        delay = self._hedge_delay(tier)
+        if delay is None:
+            return self.session.post(self.api_url, json=data, timeout=timeout, headers=headers)
+
+        primary = self._hedge_executor.submit(self.session.post, self.api_url, json=data, timeout=timeout,
+                                              headers=headers)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._hedge_budget_available():
+            return primary.result()
+
+        print(f"🪁 xAI call slower than p{HEDGE_PERCENTILE:g} ({delay:.1f}s), sending hedge request")
+        metrics.increment('xai.hedge.sent')
+        hedge = self._hedge_executor.submit(self.session.post, self.api_url, json=data, timeout=timeout,
+                                            headers=headers)
+
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    if not loser.cancel():
+                        loser.add_done_callback(self._discard_response)
+                if future is hedge:
+                    metrics.increment('xai.hedge.won')
+                return future.result()
+        raise error
+
+    def _hedge_delay(self, tier):
+        """Seconds to wait before hedging on this tier, or None if hedging is off"""
+        if not self._hedge_executor:
+            return None
+        name = f'xai.{tier}.latency_s'
+        if metrics.sample_count(name) < HEDGE_MIN_SAMPLES:
+            return None
+        return metrics.percentile(name, HEDGE_PERCENTILE)
+
+    def _hedge_budget_available(self):
+        """True while hedges stay under HEDGE_MAX_RATIO of all calls (counting this one)"""
+        sent = metrics.get_counter('xai.hedge.sent')
+        calls = metrics.get_counter('xai.calls') + 1
+        return (sent + 1) / calls <= HEDGE_MAX_RATIO
+
+    @staticmethod
+    def _discard_response(future):
+        """Close the losing hedge response so its connection goes back to the pool"""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _record_tier_usage(self, tier, latency, usage):
+        """Record latency and token accounting for one call on a model tier"""
+        usage = usage or {}
+        details = usage.get('completion_tokens_details') or {}
+        # Prompt tokens served from the provider's prefix cache
+        cached_tokens = (usage.get('prompt_tokens_details') or {}).get('cached_tokens', 0)
+        metrics.increment(f'xai.{tier}.calls')
+        metrics.observe(f'xai.{tier}.latency_s', latency)
+        metrics.increment(f'xai.{tier}.prompt_tokens', usage.get('prompt_tokens', 0))
+        metrics.increment(f'xai.{tier}.cached_prompt_tokens', cached_tokens)
+        if usage.get('prompt_tokens'):
+            metrics.observe(f'xai.{tier}.prompt_cache_ratio', cached_tokens / usage['prompt_tokens'])
+        metrics.increment(f'xai.{tier}.completion_tokens', usage.get('completion_tokens', 0))
+        metrics.increment(f'xai.{tier}.reasoning_tokens', details.get('reasoning_tokens', 0))
+
+    def _get_semaphore(self):
+        """Return the concurrency limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+        return semaphore